@@ -6,6 +6,7 @@ This script helps export health data from Apple Health on macOS.
 It can trigger exports via AppleScript and parse the resulting XML data.
 """
 
+import os
 import subprocess
 import sys
 from datetime import UTC, datetime
@@ -57,13 +58,34 @@ def find_health_export(search_dir=None):
         search_dir = Path.home() / "Downloads"
 
     search_path = Path(search_dir)
-    export_files = list(search_path.glob("export*.zip"))
 
-    if not export_files:
-        return None
+    # Health.app names exports ``export.zip``, so stat that directly and only
+    # let another ``export*.zip`` win if it is strictly newer.
+    most_recent = search_path / "export.zip"
+    try:
+        most_recent_mtime = most_recent.stat().st_mtime
+    except OSError:
+        most_recent, most_recent_mtime = None, None
+
+    try:
+        entries = os.scandir(search_path)
+    except OSError:
+        return most_recent
+
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if name == "export.zip" or not (name.startswith("export") and name.endswith(".zip")):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if most_recent_mtime is None or mtime > most_recent_mtime:
+                most_recent, most_recent_mtime = Path(entry.path), mtime
 
-    # Return the most recently modified file
-    most_recent = max(export_files, key=lambda p: p.stat().st_mtime)
     return most_recent
 
 
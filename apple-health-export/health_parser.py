@@ -5,13 +5,35 @@ Apple Health Data Parser
 Parse exported Apple Health XML data and convert to useful formats (CSV, JSON).
 """
 
+import contextlib
 import csv
+import mmap
 import sys
 import xml.etree.ElementTree as ET
 from datetime import UTC, datetime
 from pathlib import Path
 
 
+@contextlib.contextmanager
+def _open_xml_source(xml_file):
+    """Yield a read-only memory map of *xml_file* for the XML parser.
+
+    Mapping lets the kernel page the export in on demand instead of copying it
+    through read() buffers. Empty files cannot be mapped, so those fall back to
+    the plain file object.
+    """
+    with open(xml_file, 'rb') as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield f
+            return
+        with mapping:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapping
+
+
 class HealthDataParser:
     """Parser for Apple Health export XML data."""
 
@@ -26,7 +48,8 @@ class HealthDataParser:
         print("This may take a while for large exports...")
 
         try:
-            self.tree = ET.parse(self.xml_file)
+            with _open_xml_source(self.xml_file) as source:
+                self.tree = ET.parse(source)
             self.root = self.tree.getroot()
             print("Parsing complete!")
             return True
@@ -76,6 +99,8 @@ class HealthDataParser:
 
         records = []
         record_count = 0
+        # Metadata keys repeat across records; map each raw key to its column once.
+        metadata_columns = {}
 
         for record in self.root.findall('.//Record'):
             # Filter by type if specified
@@ -113,11 +138,13 @@ class HealthDataParser:
             }
 
             # Add metadata if present
-            metadata_elements = record.findall('.//MetadataEntry')
-            for meta in metadata_elements:
-                key = meta.get('key', '').replace('HKMetadataKey', '')
-                value = meta.get('value', '')
-                record_data[f'metadata_{key}'] = value
+            for meta in record.iterfind('.//MetadataEntry'):
+                raw_key = meta.get('key', '')
+                column = metadata_columns.get(raw_key)
+                if column is None:
+                    column = f"metadata_{raw_key.replace('HKMetadataKey', '')}"
+                    metadata_columns[raw_key] = column
+                record_data[column] = meta.get('value', '')
 
             records.append(record_data)
             record_count += 1
@@ -122,6 +122,26 @@ class TestHealthExport(unittest.TestCase):
         # Should return the newest file
         self.assertEqual(result, files[2])
 
+    def test_find_health_export_prefers_newer_than_canonical(self):
+        """Test that a newer export*.zip beats the canonical export.zip."""
+        canonical = self.temp_path / "export.zip"
+        newer = self.temp_path / "export 2.zip"
+        canonical.touch()
+        newer.touch()
+        os.utime(canonical, (0, 0))
+
+        result = health_export.find_health_export(self.temp_dir)
+
+        self.assertEqual(result, newer)
+
+    def test_find_health_export_ignores_other_zips(self):
+        """Test that zips not matching export*.zip are ignored."""
+        (self.temp_path / "photos.zip").touch()
+
+        result = health_export.find_health_export(self.temp_dir)
+
+        self.assertIsNone(result)
+
     def test_extract_export_success(self):
         """Test extracting a valid export.zip file."""
         zip_path = self.create_sample_export_zip()
@@ -59,6 +59,16 @@ class TestHealthDataParser(unittest.TestCase):
 
         self.assertFalse(result)
 
+    def test_parse_empty_file(self):
+        """Test parsing an empty file that cannot be memory-mapped."""
+        empty_xml = self.temp_path / "empty.xml"
+        empty_xml.touch()
+
+        parser = health_parser.HealthDataParser(empty_xml)
+        result = parser.parse()
+
+        self.assertFalse(result)
+
     def test_parse_missing_file(self):
         """Test parsing when file doesn't exist."""
         missing_file = self.temp_path / "missing.xml"
@@ -4,16 +4,47 @@ import argparse
 import hashlib
 import json
 import os
-from collections.abc import Iterable
+import re
+import shutil
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Self
 from zipfile import ZipFile
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from ciso8601 import parse_datetime as _ciso_parse_datetime
+except ImportError:  # pragma: no cover - optional speedup
+    _ciso_parse_datetime = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - guarded at write time so `guide` works without it
+    pa = pc = pq = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None  # type: ignore[assignment]
+
 DEFAULT_RAW_ROOT = Path(os.getenv("DATALAKE_RAW_ROOT", "~/datalake.me/raw")).expanduser()
 DEFAULT_CURATED_ROOT = Path(os.getenv("DATALAKE_CURATED_ROOT", "~/datalake.me/curated")).expanduser()
 DEFAULT_STATE_FILE = Path.home() / ".local" / "share" / "datalake" / "google_takeout_focused_state.json"
+_WRITE_BATCH_ROWS = 65_536
+_EPOCH = datetime(1970, 1, 1)
+# Path fragments the extractors read from; anything else in a Takeout is skipped unparsed.
+_SCOPE_MARKERS = ("Location History", "My Activity/Search/", "My Activity/YouTube and YouTube Music/")
+_YOUTUBE_MUSIC_RE = re.compile(r"youtube music|music\.youtube\.com", re.IGNORECASE)
 
 
 @dataclass(frozen=True)
@@ -22,11 +53,42 @@ class JsonDocument:
     payload: Any
 
 
+@dataclass(frozen=True)
+class StreamedLocations:
+    """Location History ``Records.json`` whose ``locations`` array is streamed with ijson.
+
+    ``member`` is the archive member name when ``source`` is a Takeout zip. A malformed or
+    truncated file raises ``ValueError`` rather than ending the stream early, matching
+    ``_parse_location_records`` when ijson is not installed.
+    """
+
+    source: Path
+    member: str | None = None
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        try:
+            if self.member is None:
+                with self.source.open("rb") as stream:
+                    yield from ijson.items(stream, "locations.item", use_float=True)
+            else:
+                with ZipFile(self.source) as archive, archive.open(self.member) as stream:
+                    yield from ijson.items(stream, "locations.item", use_float=True)
+        except ijson.JSONError as exc:
+            name = self.source if self.member is None else f"{self.source}:{self.member}"
+            raise ValueError(f"Malformed location records in {name}: {exc}") from exc
+
+
 def _parse_iso(value: str | None) -> datetime | None:
     if not value:
         return None
-    normalized = value.replace("Z", "+00:00")
-    dt = datetime.fromisoformat(normalized)
+    dt = None
+    if _ciso_parse_datetime is not None:
+        try:
+            dt = _ciso_parse_datetime(value)
+        except ValueError:
+            pass
+    if dt is None:
+        dt = datetime.fromisoformat(value)
     if dt.tzinfo is None:
         return dt
     return dt.astimezone(UTC).replace(tzinfo=None)
@@ -35,8 +97,8 @@ def _parse_iso(value: str | None) -> datetime | None:
 def _parse_ts_millis(value: str | int | None) -> datetime | None:
     if value is None:
         return None
-    millis = int(value)
-    return datetime.fromtimestamp(millis / 1000, tz=UTC).replace(tzinfo=None)
+    # Exact integer arithmetic on a naive epoch; roughly twice as fast as fromtimestamp + replace.
+    return _EPOCH + timedelta(milliseconds=int(value))
 
 
 def _e7(value: int | None) -> float | None:
@@ -45,122 +107,193 @@ def _e7(value: int | None) -> float | None:
     return value / 1e7
 
 
-def _stable_id(prefix: str, payload: Any) -> str:
-    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+def _json_loads(data: bytes) -> Any:
+    """Parse raw JSON bytes without a separate decode step."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a payload column value, preferring orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except orjson.JSONEncodeError:  # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _canonical_json(payload: Any) -> str:
+    """Sorted-key ASCII JSON; hashed for stable ids and stored as the payload column."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+
+
+def _stable_id(prefix: str, canonical: str) -> str:
+    digest = hashlib.sha256(canonical.encode("ascii")).hexdigest()[:16]
     return f"{prefix}-{digest}"
 
 
 def _normalize_logical_path(path: str) -> str:
     normalized = path.replace("\\", "/")
-    marker = "/Takeout/"
-    if marker in normalized:
-        normalized = normalized.split(marker, 1)[1]
+    _, marker, tail = normalized.partition("/Takeout/")
+    if marker:
+        normalized = tail
     elif normalized.startswith("Takeout/"):
         normalized = normalized[len("Takeout/") :]
     return normalized.lstrip("./")
 
 
+def _is_in_scope(logical_path: str) -> bool:
+    return any(marker in logical_path for marker in _SCOPE_MARKERS)
+
+
+def _is_location_records(logical_path: str) -> bool:
+    return "Location History" in logical_path and logical_path.endswith("Records.json")
+
+
+def _parse_json_source(source: Path | bytes) -> Any | None:
+    """Parse one JSON file or zip member, returning ``None`` when it is not valid JSON."""
+    try:
+        return _json_loads(source.read_bytes() if isinstance(source, Path) else source)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def _parse_location_records(source: Path | bytes, name: str) -> Any:
+    """Parse a whole ``Records.json``, raising like ``StreamedLocations`` when it is malformed.
+
+    Other files are skipped when unparseable, but rows from a streamed ``Records.json`` are
+    written before the error surfaces, so both paths reject a bad one loudly instead.
+    """
+    try:
+        return _json_loads(source.read_bytes() if isinstance(source, Path) else source)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Malformed location records in {name}: {exc}") from exc
+
+
 def _load_json_documents(source: Path) -> list[JsonDocument]:
-    docs: list[JsonDocument] = []
+    # Each file is parsed as soon as it is read, so only one file's raw bytes are held at a time.
+    entries: list[tuple[str, Any]] = []
     if source.is_dir():
         for path in sorted(source.rglob("*.json")):
-            try:
-                payload = json.loads(path.read_text(encoding="utf-8"))
-            except (json.JSONDecodeError, UnicodeDecodeError):
+            logical_path = _normalize_logical_path(str(path.relative_to(source)))
+            if not _is_in_scope(logical_path):
                 continue
-            docs.append(JsonDocument(logical_path=_normalize_logical_path(str(path.relative_to(source))), payload=payload))
-        return docs
-
-    if source.is_file() and source.suffix.lower() == ".zip":
+            if not _is_location_records(logical_path):
+                payload = _parse_json_source(path)
+            elif ijson is not None:
+                payload = StreamedLocations(path)
+            else:
+                payload = _parse_location_records(path, str(path))
+            entries.append((logical_path, payload))
+    elif source.is_file() and source.suffix.lower() == ".zip":
         with ZipFile(source) as archive:
-            for member in sorted(archive.namelist()):
+            # Walk members in stored order so the archive is read front to back.
+            for info in archive.infolist():
+                member = info.filename
                 if not member.lower().endswith(".json"):
                     continue
-                try:
-                    payload = json.loads(archive.read(member).decode("utf-8"))
-                except (json.JSONDecodeError, UnicodeDecodeError):
+                logical_path = _normalize_logical_path(member)
+                if not _is_in_scope(logical_path):
                     continue
-                docs.append(JsonDocument(logical_path=_normalize_logical_path(member), payload=payload))
-        return docs
-
-    raise ValueError(f"Unsupported source input: {source}")
-
-
-def _extract_location_rows(docs: Iterable[JsonDocument]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    visits: list[dict[str, Any]] = []
-    routes: list[dict[str, Any]] = []
+                if not _is_location_records(logical_path):
+                    payload = _parse_json_source(archive.read(info))
+                elif ijson is not None:
+                    payload = StreamedLocations(source, member)
+                else:
+                    payload = _parse_location_records(archive.read(info), f"{source}:{member}")
+                entries.append((logical_path, payload))
+        entries.sort(key=lambda entry: entry[0])
+    else:
+        raise ValueError(f"Unsupported source input: {source}")
+
+    return [JsonDocument(logical_path=path, payload=payload) for path, payload in entries if payload is not None]
+
+
+def _append_location_rows(doc: JsonDocument, visits: _RowSink, routes: _RowSink) -> None:
+    path = doc.logical_path
+    payload = doc.payload
+    # Local aliases skip a global lookup per call in loops that run once per location point.
+    append_visit, append_route = visits.append, routes.append
+    canonical_json, stable_id, parse_iso, parse_ts_millis, e7 = (
+        _canonical_json,
+        _stable_id,
+        _parse_iso,
+        _parse_ts_millis,
+        _e7,
+    )
 
-    for doc in docs:
-        path = doc.logical_path
-        payload = doc.payload
+    if _is_location_records(path) and isinstance(payload, StreamedLocations | dict):
+        locations = payload if isinstance(payload, StreamedLocations) else payload.get("locations", [])
+        for item in locations:
+            canonical = canonical_json(item)
+            append_visit(
+                {
+                    "event_id": stable_id("record", canonical),
+                    "source_type": "record",
+                    "event_ts": parse_ts_millis(item.get("timestampMs")),
+                    "start_ts": None,
+                    "end_ts": None,
+                    "place_name": None,
+                    "place_id": None,
+                    "lat": e7(item.get("latitudeE7")),
+                    "lon": e7(item.get("longitudeE7")),
+                    "confidence": None,
+                    "source_file": path,
+                    "payload": canonical,
+                }
+            )
 
-        if "Location History" in path and path.endswith("Records.json") and isinstance(payload, dict):
-            for item in payload.get("locations", []):
-                visits.append(
+    if "Semantic Location History" in path and isinstance(payload, dict):
+        timeline_objects = payload.get("timelineObjects", [])
+        for timeline_object in timeline_objects:
+            place_visit = timeline_object.get("placeVisit")
+            if place_visit:
+                canonical = canonical_json(place_visit)
+                duration = place_visit.get("duration", {})
+                location = place_visit.get("location", {})
+                start_ts = parse_iso(duration.get("startTimestamp"))
+                append_visit(
                     {
-                        "event_id": _stable_id("record", item),
-                        "source_type": "record",
-                        "event_ts": _parse_ts_millis(item.get("timestampMs")),
-                        "start_ts": None,
-                        "end_ts": None,
-                        "place_name": None,
-                        "place_id": None,
-                        "lat": _e7(item.get("latitudeE7")),
-                        "lon": _e7(item.get("longitudeE7")),
-                        "confidence": None,
+                        "event_id": stable_id("visit", canonical),
+                        "source_type": "place_visit",
+                        "event_ts": start_ts,
+                        "start_ts": start_ts,
+                        "end_ts": parse_iso(duration.get("endTimestamp")),
+                        "place_name": location.get("name"),
+                        "place_id": location.get("placeId"),
+                        "lat": e7(location.get("latitudeE7")),
+                        "lon": e7(location.get("longitudeE7")),
+                        "confidence": float(place_visit.get("visitConfidence")) if place_visit.get("visitConfidence") else None,
                         "source_file": path,
-                        "payload": json.dumps(item, ensure_ascii=True),
+                        "payload": canonical,
                     }
                 )
 
-        if "Semantic Location History" in path and isinstance(payload, dict):
-            timeline_objects = payload.get("timelineObjects", [])
-            for timeline_object in timeline_objects:
-                place_visit = timeline_object.get("placeVisit")
-                if place_visit:
-                    duration = place_visit.get("duration", {})
-                    location = place_visit.get("location", {})
-                    visits.append(
-                        {
-                            "event_id": _stable_id("visit", place_visit),
-                            "source_type": "place_visit",
-                            "event_ts": _parse_iso(duration.get("startTimestamp")),
-                            "start_ts": _parse_iso(duration.get("startTimestamp")),
-                            "end_ts": _parse_iso(duration.get("endTimestamp")),
-                            "place_name": location.get("name"),
-                            "place_id": location.get("placeId"),
-                            "lat": _e7(location.get("latitudeE7")),
-                            "lon": _e7(location.get("longitudeE7")),
-                            "confidence": float(place_visit.get("visitConfidence")) if place_visit.get("visitConfidence") else None,
-                            "source_file": path,
-                            "payload": json.dumps(place_visit, ensure_ascii=True),
-                        }
-                    )
-
-                activity_segment = timeline_object.get("activitySegment")
-                if activity_segment:
-                    duration = activity_segment.get("duration", {})
-                    start_loc = activity_segment.get("startLocation", {})
-                    end_loc = activity_segment.get("endLocation", {})
-                    routes.append(
-                        {
-                            "route_id": _stable_id("route", activity_segment),
-                            "event_ts": _parse_iso(duration.get("startTimestamp")),
-                            "start_ts": _parse_iso(duration.get("startTimestamp")),
-                            "end_ts": _parse_iso(duration.get("endTimestamp")),
-                            "activity_type": activity_segment.get("activityType"),
-                            "distance_m": activity_segment.get("distance"),
-                            "start_lat": _e7(start_loc.get("latitudeE7")),
-                            "start_lon": _e7(start_loc.get("longitudeE7")),
-                            "end_lat": _e7(end_loc.get("latitudeE7")),
-                            "end_lon": _e7(end_loc.get("longitudeE7")),
-                            "source_file": path,
-                            "payload": json.dumps(activity_segment, ensure_ascii=True),
-                        }
-                    )
-
-    return visits, routes
+            activity_segment = timeline_object.get("activitySegment")
+            if activity_segment:
+                canonical = canonical_json(activity_segment)
+                duration = activity_segment.get("duration", {})
+                start_loc = activity_segment.get("startLocation", {})
+                end_loc = activity_segment.get("endLocation", {})
+                start_ts = parse_iso(duration.get("startTimestamp"))
+                append_route(
+                    {
+                        "route_id": stable_id("route", canonical),
+                        "event_ts": start_ts,
+                        "start_ts": start_ts,
+                        "end_ts": parse_iso(duration.get("endTimestamp")),
+                        "activity_type": activity_segment.get("activityType"),
+                        "distance_m": activity_segment.get("distance"),
+                        "start_lat": e7(start_loc.get("latitudeE7")),
+                        "start_lon": e7(start_loc.get("longitudeE7")),
+                        "end_lat": e7(end_loc.get("latitudeE7")),
+                        "end_lon": e7(end_loc.get("longitudeE7")),
+                        "source_file": path,
+                        "payload": canonical,
+                    }
+                )
 
 
 def _extract_search_query(title: str | None) -> str | None:
@@ -173,76 +306,76 @@ def _extract_search_query(title: str | None) -> str | None:
     return title.strip()
 
 
-def _extract_search_rows(docs: Iterable[JsonDocument]) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    for doc in docs:
-        if "My Activity/Search/" not in doc.logical_path:
-            continue
-        payload = doc.payload
-        if not isinstance(payload, list):
-            continue
-
-        for item in payload:
-            title = item.get("title")
-            rows.append(
-                {
-                    "search_id": _stable_id("search", item),
-                    "event_ts": _parse_iso(item.get("time")),
-                    "query": _extract_search_query(title),
-                    "title": title,
-                    "title_url": item.get("titleUrl"),
-                    "products": json.dumps(item.get("products", []), ensure_ascii=True),
-                    "source_file": doc.logical_path,
-                    "payload": json.dumps(item, ensure_ascii=True),
-                }
-            )
-    return rows
+def _append_search_rows(doc: JsonDocument, rows: _RowSink) -> None:
+    payload = doc.payload
+    if "My Activity/Search/" not in doc.logical_path or not isinstance(payload, list):
+        return
+    append_row = rows.append
+    canonical_json, stable_id, parse_iso = _canonical_json, _stable_id, _parse_iso
+    extract_search_query, json_dumps = _extract_search_query, _json_dumps
+
+    for item in payload:
+        title = item.get("title")
+        canonical = canonical_json(item)
+        append_row(
+            {
+                "search_id": stable_id("search", canonical),
+                "event_ts": parse_iso(item.get("time")),
+                "query": extract_search_query(title),
+                "title": title,
+                "title_url": item.get("titleUrl"),
+                "products": json_dumps(item.get("products", [])),
+                "source_file": doc.logical_path,
+                "payload": canonical,
+            }
+        )
 
 
 def _extract_subtitles(item: dict[str, Any]) -> str | None:
     subtitles = item.get("subtitles")
     if not isinstance(subtitles, list):
         return None
-    names = [sub.get("name") for sub in subtitles if isinstance(sub, dict) and sub.get("name")]
-    if not names:
-        return None
-    return " | ".join(names)
+    names = [name for sub in subtitles if isinstance(sub, dict) and (name := sub.get("name"))]
+    return " | ".join(names) if names else None
 
 
-def _is_youtube_music_event(item: dict[str, Any]) -> bool:
-    header = (item.get("header") or "").lower()
-    title_url = (item.get("titleUrl") or "").lower()
-    title = (item.get("title") or "").lower()
-    subtitle_text = (_extract_subtitles(item) or "").lower()
-    signals = [header, title_url, title, subtitle_text]
-    return any("youtube music" in signal or "music.youtube.com" in signal for signal in signals)
+def _is_youtube_music_event(item: dict[str, Any], subtitle_text: str | None) -> bool:
+    """``subtitle_text`` is ``_extract_subtitles(item)``, passed in so callers join subtitles once."""
+    for key in ("header", "titleUrl", "title"):
+        value = item.get(key)
+        if value and _YOUTUBE_MUSIC_RE.search(value):
+            return True
+    return bool(subtitle_text and _YOUTUBE_MUSIC_RE.search(subtitle_text))
 
 
-def _extract_music_rows(docs: Iterable[JsonDocument]) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
-    for doc in docs:
-        if "My Activity/YouTube and YouTube Music/" not in doc.logical_path:
+def _append_music_rows(doc: JsonDocument, rows: _RowSink) -> None:
+    payload = doc.payload
+    if "My Activity/YouTube and YouTube Music/" not in doc.logical_path or not isinstance(payload, list):
+        return
+    append_row = rows.append
+    canonical_json, stable_id, parse_iso = _canonical_json, _stable_id, _parse_iso
+    is_youtube_music_event, extract_subtitles = _is_youtube_music_event, _extract_subtitles
+
+    for item in payload:
+        if not isinstance(item, dict):
             continue
-        payload = doc.payload
-        if not isinstance(payload, list):
+        # Every rejected event checks its subtitles and every kept one stores them, so join once.
+        subtitle = extract_subtitles(item)
+        if not is_youtube_music_event(item, subtitle):
             continue
-
-        for item in payload:
-            if not isinstance(item, dict) or not _is_youtube_music_event(item):
-                continue
-            rows.append(
-                {
-                    "event_id": _stable_id("ytm", item),
-                    "event_ts": _parse_iso(item.get("time")),
-                    "title": item.get("title"),
-                    "title_url": item.get("titleUrl"),
-                    "header": item.get("header"),
-                    "subtitle": _extract_subtitles(item),
-                    "source_file": doc.logical_path,
-                    "payload": json.dumps(item, ensure_ascii=True),
-                }
-            )
-    return rows
+        canonical = canonical_json(item)
+        append_row(
+            {
+                "event_id": stable_id("ytm", canonical),
+                "event_ts": parse_iso(item.get("time")),
+                "title": item.get("title"),
+                "title_url": item.get("titleUrl"),
+                "header": item.get("header"),
+                "subtitle": subtitle,
+                "source_file": doc.logical_path,
+                "payload": canonical,
+            }
+        )
 
 
 def _partition_values(ts: datetime | None) -> tuple[str, str]:
@@ -251,48 +384,181 @@ def _partition_values(ts: datetime | None) -> tuple[str, str]:
     return f"{ts.year:04d}", f"{ts.month:02d}"
 
 
-def _write_partitioned_parquet(
-    rows: list[dict[str, Any]],
-    dataset_root: Path,
-    source_token: str,
-    table_name: str,
-    columns: list[tuple[str, str]],
-    ts_column: str,
-) -> int:
-    if not rows:
-        return 0
-    try:
-        import duckdb
-    except ModuleNotFoundError as exc:
-        raise RuntimeError("duckdb is required for parquet export. Install dependencies first.") from exc
-
-    grouped: dict[tuple[str, str], list[dict[str, Any]]] = {}
-    for row in rows:
-        year, month = _partition_values(row.get(ts_column))
-        grouped.setdefault((year, month), []).append(row)
-
-    written = 0
-    for (year, month), group_rows in grouped.items():
-        out_dir = dataset_root / f"year={year}" / f"month={month}"
-        out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"{source_token}.parquet"
-
-        conn = duckdb.connect()
+_ARROW_TYPES = {
+    "VARCHAR": "string",
+    "JSON": "string",
+    "DOUBLE": "float64",
+    "TIMESTAMP": "timestamp[us]",
+}
+
+
+_DATASET_COLUMNS: dict[str, list[tuple[str, str]]] = {
+    "location_visits": [
+        ("event_id", "VARCHAR"),
+        ("source_type", "VARCHAR"),
+        ("event_ts", "TIMESTAMP"),
+        ("start_ts", "TIMESTAMP"),
+        ("end_ts", "TIMESTAMP"),
+        ("place_name", "VARCHAR"),
+        ("place_id", "VARCHAR"),
+        ("lat", "DOUBLE"),
+        ("lon", "DOUBLE"),
+        ("confidence", "DOUBLE"),
+        ("source_file", "VARCHAR"),
+        ("payload", "JSON"),
+    ],
+    "location_routes": [
+        ("route_id", "VARCHAR"),
+        ("event_ts", "TIMESTAMP"),
+        ("start_ts", "TIMESTAMP"),
+        ("end_ts", "TIMESTAMP"),
+        ("activity_type", "VARCHAR"),
+        ("distance_m", "DOUBLE"),
+        ("start_lat", "DOUBLE"),
+        ("start_lon", "DOUBLE"),
+        ("end_lat", "DOUBLE"),
+        ("end_lon", "DOUBLE"),
+        ("source_file", "VARCHAR"),
+        ("payload", "JSON"),
+    ],
+    "search_history": [
+        ("search_id", "VARCHAR"),
+        ("event_ts", "TIMESTAMP"),
+        ("query", "VARCHAR"),
+        ("title", "VARCHAR"),
+        ("title_url", "VARCHAR"),
+        ("products", "JSON"),
+        ("source_file", "VARCHAR"),
+        ("payload", "JSON"),
+    ],
+    "youtube_music_history": [
+        ("event_id", "VARCHAR"),
+        ("event_ts", "TIMESTAMP"),
+        ("title", "VARCHAR"),
+        ("title_url", "VARCHAR"),
+        ("header", "VARCHAR"),
+        ("subtitle", "VARCHAR"),
+        ("source_file", "VARCHAR"),
+        ("payload", "JSON"),
+    ],
+}
+
+
+# Low-cardinality columns worth dictionary-encoding; ids, timestamps and payloads are
+# near-unique, so dictionary pages for them would only be built and thrown away.
+_DICTIONARY_COLUMNS = frozenset({"source_type", "place_name", "place_id", "activity_type", "header", "source_file"})
+
+
+def _partial_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.name}.partial")
+
+
+class _PartitionedParquetSink:
+    """Row sink that writes hive-partitioned parquet in bounded batches as rows arrive.
+
+    Rows are buffered until ``_WRITE_BATCH_ROWS`` accumulate, then converted to Arrow and
+    appended to one lazily opened ``ParquetWriter`` per (year, month) partition, so memory
+    stays bounded however large the takeout is. When ``payload_root`` is given, the wide
+    ``payload`` column is written there instead, keyed by the first (id) column and
+    partitioned the same way, so the main dataset stays narrow for analytical scans.
+    """
+
+    def __init__(
+        self,
+        dataset_root: Path,
+        source_token: str,
+        columns: list[tuple[str, str]],
+        ts_column: str,
+        payload_root: Path | None = None,
+    ) -> None:
+        if pa is None:
+            raise RuntimeError("pyarrow is required for parquet export. Install dependencies first.")
+        self.dataset_root = dataset_root
+        self.source_token = source_token
+        self.ts_column = ts_column
+        self.payload_root = payload_root
+        self.schema = pa.schema([(name, pa.type_for_alias(_ARROW_TYPES[sql_type])) for name, sql_type in columns])
+        self.written = 0
+        self._getter = itemgetter(*self.schema.names)
+        self._buffer: list[dict[str, Any]] = []
+        self._writers: dict[Path, pq.ParquetWriter] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        # Files are written under a .partial name and only renamed into the dataset once every
+        # batch is flushed, so a failed extraction leaves no valid-looking partial parquet behind.
+        completed = False
         try:
-            cols_sql = ", ".join(f"{name} {sql_type}" for name, sql_type in columns)
-            placeholders = ", ".join("?" for _ in columns)
-            insert_sql = f"insert into {table_name} values ({placeholders})"
-            conn.execute(f"create table {table_name} ({cols_sql})")
-            conn.executemany(
-                insert_sql,
-                [[row.get(name) for name, _ in columns] for row in group_rows],
-            )
-            conn.execute(f"copy {table_name} to ? (format parquet)", [str(out_path)])
-            written += len(group_rows)
+            if exc_type is None:
+                self._flush()
+                completed = True
         finally:
-            conn.close()
-
-    return written
+            for out_path, writer in self._writers.items():
+                writer.close()
+                partial = _partial_path(out_path)
+                if completed:
+                    partial.replace(out_path)
+                else:
+                    partial.unlink(missing_ok=True)
+            self._writers.clear()
+
+    def append(self, row: dict[str, Any]) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= _WRITE_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        rows, self._buffer = self._buffer, []
+        if not rows:
+            return
+
+        # Transpose rows into columns with one C-level itemgetter call per row (rather than a
+        # dict lookup per cell) so Arrow converts each column in a single call.
+        schema = self.schema
+        column_values = zip(*map(self._getter, rows), strict=True)
+        arrays = {
+            field.name: pa.array(values, type=field.type) for field, values in zip(schema, column_values, strict=True)
+        }
+        table = pa.Table.from_arrays(list(arrays.values()), schema=schema)
+
+        # Truncate every timestamp to its month in one kernel; a stable sort on that key turns each
+        # (year, month) partition into a contiguous zero-copy slice of the batch, and the partition
+        # directory names are only formatted once per run.
+        partition_key = pc.floor_temporal(arrays[self.ts_column], unit="month")
+        order = pc.sort_indices(partition_key)
+        table = table.take(order)
+        runs = pc.run_end_encode(partition_key.take(order))
+
+        outputs = [(self.dataset_root, table)]
+        if self.payload_root is not None:
+            outputs = [
+                (self.dataset_root, table.drop_columns(["payload"])),
+                (self.payload_root, table.select([schema.names[0], "payload"])),
+            ]
+
+        start = 0
+        for run_end, month_start in zip(runs.run_ends.to_pylist(), runs.values.to_pylist(), strict=True):
+            year, month = _partition_values(month_start)
+            for root, output in outputs:
+                out_path = root / f"year={year}" / f"month={month}" / f"{self.source_token}.parquet"
+                self._writer(out_path, output.schema).write_table(output.slice(start, run_end - start))
+            start = run_end
+        self.written += table.num_rows
+
+    def _writer(self, out_path: Path, schema: pa.Schema) -> pq.ParquetWriter:
+        writer = self._writers.get(out_path)
+        if writer is None:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            writer = pq.ParquetWriter(
+                _partial_path(out_path),
+                schema,
+                compression="zstd",
+                use_dictionary=[name for name in schema.names if name in _DICTIONARY_COLUMNS],
+            )
+            self._writers[out_path] = writer
+        return writer
 
 
 def _stable_source_token(path: Path) -> str:
@@ -319,101 +585,48 @@ def _state_save(path: Path, payload: dict[str, Any]) -> None:
     path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
 
 
-def _process_one_takeout(source: Path, curated_root: Path) -> dict[str, int]:
-    docs = _load_json_documents(source)
-    location_visits, location_routes = _extract_location_rows(docs)
-    search_rows = _extract_search_rows(docs)
-    music_rows = _extract_music_rows(docs)
+_RowSink = list[dict[str, Any]] | _PartitionedParquetSink
 
-    token = _stable_source_token(source)
-    base = curated_root / "google_takeout"
 
-    location_count = _write_partitioned_parquet(
-        rows=location_visits,
-        dataset_root=base / "location_visits",
-        source_token=token,
-        table_name="location_visits",
-        columns=[
-            ("event_id", "VARCHAR"),
-            ("source_type", "VARCHAR"),
-            ("event_ts", "TIMESTAMP"),
-            ("start_ts", "TIMESTAMP"),
-            ("end_ts", "TIMESTAMP"),
-            ("place_name", "VARCHAR"),
-            ("place_id", "VARCHAR"),
-            ("lat", "DOUBLE"),
-            ("lon", "DOUBLE"),
-            ("confidence", "DOUBLE"),
-            ("source_file", "VARCHAR"),
-            ("payload", "JSON"),
-        ],
-        ts_column="event_ts",
-    )
+def _route_documents(
+    docs: Iterable[JsonDocument], visits: _RowSink, routes: _RowSink, searches: _RowSink, music: _RowSink
+) -> None:
+    """Route each document to every dataset it feeds in one walk over ``docs``."""
+    for doc in docs:
+        _append_location_rows(doc, visits, routes)
+        _append_search_rows(doc, searches)
+        _append_music_rows(doc, music)
 
-    route_count = _write_partitioned_parquet(
-        rows=location_routes,
-        dataset_root=base / "location_routes",
-        source_token=token,
-        table_name="location_routes",
-        columns=[
-            ("route_id", "VARCHAR"),
-            ("event_ts", "TIMESTAMP"),
-            ("start_ts", "TIMESTAMP"),
-            ("end_ts", "TIMESTAMP"),
-            ("activity_type", "VARCHAR"),
-            ("distance_m", "DOUBLE"),
-            ("start_lat", "DOUBLE"),
-            ("start_lon", "DOUBLE"),
-            ("end_lat", "DOUBLE"),
-            ("end_lon", "DOUBLE"),
-            ("source_file", "VARCHAR"),
-            ("payload", "JSON"),
-        ],
-        ts_column="event_ts",
-    )
 
-    search_count = _write_partitioned_parquet(
-        rows=search_rows,
-        dataset_root=base / "search_history",
-        source_token=token,
-        table_name="search_history",
-        columns=[
-            ("search_id", "VARCHAR"),
-            ("event_ts", "TIMESTAMP"),
-            ("query", "VARCHAR"),
-            ("title", "VARCHAR"),
-            ("title_url", "VARCHAR"),
-            ("products", "JSON"),
-            ("source_file", "VARCHAR"),
-            ("payload", "JSON"),
-        ],
-        ts_column="event_ts",
-    )
+def _process_one_takeout(source: Path, curated_root: Path) -> dict[str, int]:
+    docs = _load_json_documents(source)
+    token = _stable_source_token(source)
+    base = curated_root / "google_takeout"
 
-    music_count = _write_partitioned_parquet(
-        rows=music_rows,
-        dataset_root=base / "youtube_music_history",
-        source_token=token,
-        table_name="youtube_music_history",
-        columns=[
-            ("event_id", "VARCHAR"),
-            ("event_ts", "TIMESTAMP"),
-            ("title", "VARCHAR"),
-            ("title_url", "VARCHAR"),
-            ("header", "VARCHAR"),
-            ("subtitle", "VARCHAR"),
-            ("source_file", "VARCHAR"),
-            ("payload", "JSON"),
-        ],
-        ts_column="event_ts",
-    )
+    # Rows stream straight from the extractors into per-dataset parquet sinks, so a multi-GB
+    # Records.json never has to be held in memory as row dicts.
+    with ExitStack() as stack:
+        sinks = {
+            name: stack.enter_context(
+                _PartitionedParquetSink(
+                    dataset_root=base / name,
+                    source_token=token,
+                    columns=columns,
+                    ts_column="event_ts",
+                    payload_root=base / f"{name}_payload",
+                )
+            )
+            for name, columns in _DATASET_COLUMNS.items()
+        }
+        _route_documents(
+            docs,
+            sinks["location_visits"],
+            sinks["location_routes"],
+            sinks["search_history"],
+            sinks["youtube_music_history"],
+        )
 
-    return {
-        "location_visits": location_count,
-        "location_routes": route_count,
-        "search_history": search_count,
-        "youtube_music_history": music_count,
-    }
+    return {name: sink.written for name, sink in sinks.items()}
 
 
 def _copy_raw_archive(source: Path, raw_root: Path) -> Path:
@@ -423,7 +636,11 @@ def _copy_raw_archive(source: Path, raw_root: Path) -> Path:
     raw_dir.mkdir(parents=True, exist_ok=True)
     destination = raw_dir / source.name
     if not destination.exists():
-        destination.write_bytes(source.read_bytes())
+        # copyfile streams (sendfile/fcopyfile) instead of holding multi-GB archives in memory;
+        # copying to a temp name keeps an interrupted copy from being mistaken for a finished one.
+        partial = destination.with_name(f"{destination.name}.partial")
+        shutil.copyfile(source, partial)
+        partial.replace(destination)
     return destination
 
 
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime
 from pathlib import Path
+from zipfile import ZipFile
 
+import google_takeout_focused
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
 from google_takeout_focused import (
-    _extract_location_rows,
-    _extract_music_rows,
-    _extract_search_rows,
+    JsonDocument,
+    _copy_raw_archive,
     _load_json_documents,
+    _parse_iso,
+    _PartitionedParquetSink,
     _print_guide,
     _process_one_takeout,
+    _route_documents,
 )
 
 
@@ -18,6 +26,13 @@ def _write_json(path: Path, payload: object) -> None:
     path.write_text(json.dumps(payload), encoding="utf-8")
 
 
+def _route(docs: list[JsonDocument]) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
+    """Return ``(visits, routes, searches, music)`` rows for ``docs``."""
+    rows: tuple[list[dict], ...] = ([], [], [], [])
+    _route_documents(docs, *rows)
+    return rows
+
+
 def test_extracts_location_search_and_music_rows(tmp_path: Path) -> None:
     takeout_root = tmp_path / "Takeout"
 
@@ -104,9 +119,7 @@ def test_extracts_location_search_and_music_rows(tmp_path: Path) -> None:
     )
 
     docs = _load_json_documents(takeout_root)
-    location_visits, location_routes = _extract_location_rows(docs)
-    searches = _extract_search_rows(docs)
-    music = _extract_music_rows(docs)
+    location_visits, location_routes, searches, music = _route(docs)
 
     assert len(location_visits) == 2
     assert len(location_routes) == 1
@@ -154,6 +167,48 @@ def test_process_writes_parquet_outputs(tmp_path: Path) -> None:
 
     assert len(search_files) == 1
     assert len(music_files) == 1
+    assert search_files[0].parent.parts[-2:] == ("year=2024", "month=02")
+
+    search_table = pq.read_table(search_files[0])
+    assert search_table.schema.field("event_ts").type == pa.timestamp("us")
+    assert search_table.column("query").to_pylist() == ["coffee beans"]
+    assert "payload" not in search_table.column_names
+
+    payload_files = list((curated_root / "google_takeout" / "search_history_payload").rglob("*.parquet"))
+    assert [path.parent.parts[-2:] for path in payload_files] == [("year=2024", "month=02")]
+    payload_table = pq.read_table(payload_files[0])
+    assert payload_table.column_names == ["search_id", "payload"]
+    assert payload_table.column("search_id").to_pylist() == search_table.column("search_id").to_pylist()
+    assert json.loads(payload_table.column("payload")[0].as_py())["title"] == "Searched for coffee beans"
+
+
+def test_partitioned_parquet_sink_splits_by_month(tmp_path: Path) -> None:
+    rows = [
+        {"event_id": "a", "event_ts": datetime(2024, 2, 1, 8, 0)},
+        {"event_id": "b", "event_ts": None},
+        {"event_id": "c", "event_ts": datetime(2023, 12, 31, 23, 0)},
+        {"event_id": "d", "event_ts": datetime(2024, 2, 3, 9, 0)},
+    ]
+
+    with _PartitionedParquetSink(
+        dataset_root=tmp_path,
+        source_token="token",
+        columns=[("event_id", "VARCHAR"), ("event_ts", "TIMESTAMP")],
+        ts_column="event_ts",
+    ) as sink:
+        for row in rows:
+            sink.append(row)
+
+    assert sink.written == 4
+    partitions = {
+        path.parent.relative_to(tmp_path).as_posix(): pq.read_table(path).column("event_id").to_pylist()
+        for path in tmp_path.rglob("token.parquet")
+    }
+    assert partitions == {
+        "year=2023/month=12": ["c"],
+        "year=2024/month=02": ["a", "d"],
+        "year=unknown/month=unknown": ["b"],
+    }
 
 
 def test_event_ids_are_stable_across_different_input_roots(tmp_path: Path) -> None:
@@ -217,14 +272,10 @@ def test_event_ids_are_stable_across_different_input_roots(tmp_path: Path) -> No
     )
 
     docs_from_takeout = _load_json_documents(inner_takeout)
-    visits_takeout, _ = _extract_location_rows(docs_from_takeout)
-    searches_takeout = _extract_search_rows(docs_from_takeout)
-    music_takeout = _extract_music_rows(docs_from_takeout)
+    visits_takeout, _, searches_takeout, music_takeout = _route(docs_from_takeout)
 
     docs_from_parent = _load_json_documents(tmp_path / "nested")
-    visits_parent, _ = _extract_location_rows(docs_from_parent)
-    searches_parent = _extract_search_rows(docs_from_parent)
-    music_parent = _extract_music_rows(docs_from_parent)
+    visits_parent, _, searches_parent, music_parent = _route(docs_from_parent)
 
     assert {row["event_id"] for row in visits_takeout} == {row["event_id"] for row in visits_parent}
     assert {row["search_id"] for row in searches_takeout} == {row["search_id"] for row in searches_parent}
@@ -249,16 +300,172 @@ def test_ignores_non_scope_exports(tmp_path: Path) -> None:
     )
 
     docs = _load_json_documents(takeout_root)
-    location_visits, location_routes = _extract_location_rows(docs)
-    searches = _extract_search_rows(docs)
-    music = _extract_music_rows(docs)
+    location_visits, location_routes, searches, music = _route(docs)
 
+    assert docs == []
     assert len(location_visits) == 0
     assert len(location_routes) == 0
     assert len(searches) == 0
     assert len(music) == 0
 
 
+def test_loads_zip_members_and_skips_malformed_json(tmp_path: Path) -> None:
+    archive_path = tmp_path / "takeout-001.zip"
+    with ZipFile(archive_path, "w") as archive:
+        archive.writestr(
+            "Takeout/My Activity/Search/MyActivity.json",
+            json.dumps([{"title": "Searched for trail maps", "time": "2024-03-01T00:00:00Z"}]),
+        )
+        archive.writestr("Takeout/My Activity/Search/broken.json", b"{not json")
+        archive.writestr("Takeout/My Activity/Search/latin1.json", '["caf\xe9"]'.encode("latin-1"))
+
+    docs = _load_json_documents(archive_path)
+
+    assert [doc.logical_path for doc in docs] == ["My Activity/Search/MyActivity.json"]
+    assert _route(docs)[2][0]["query"] == "trail maps"
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_location_records_from_zip(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, streaming: bool) -> None:
+    if streaming:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(google_takeout_focused, "ijson", None)
+
+    archive_path = tmp_path / "takeout-001.zip"
+    with ZipFile(archive_path, "w") as archive:
+        archive.writestr(
+            "Takeout/Location History (Timeline)/Records.json",
+            json.dumps(
+                {
+                    "locations": [
+                        {"timestampMs": "1700000000000", "latitudeE7": 377700000, "longitudeE7": -1224200000},
+                        {"timestampMs": "1700000060000", "latitudeE7": 377710000, "longitudeE7": -1224300000},
+                    ]
+                }
+            ),
+        )
+
+    docs = _load_json_documents(archive_path)
+    visits, routes, _, _ = _route(docs)
+
+    assert routes == []
+    assert [row["lat"] for row in visits] == [37.77, 37.771]
+    assert visits[0]["event_ts"].isoformat() == "2023-11-14T22:13:20"
+
+
+def test_load_json_documents_skips_invalid_json(tmp_path: Path) -> None:
+    takeout_root = tmp_path / "Takeout"
+    for index in range(3):
+        _write_json(
+            takeout_root / "My Activity" / "Search" / f"MyActivity{index}.json",
+            [{"title": f"Searched for query {index}", "time": "2024-03-01T00:00:00Z"}],
+        )
+    (takeout_root / "My Activity" / "Search" / "broken.json").write_text("{not json", encoding="utf-8")
+
+    docs = _load_json_documents(takeout_root)
+
+    assert [doc.logical_path for doc in docs] == [f"My Activity/Search/MyActivity{index}.json" for index in range(3)]
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_truncated_location_records_raise(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, streaming: bool) -> None:
+    if streaming:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(google_takeout_focused, "ijson", None)
+    records = tmp_path / "Takeout" / "Location History (Timeline)" / "Records.json"
+    records.parent.mkdir(parents=True)
+    records.write_text(
+        '{"locations": [{"timestampMs": "1700000000000", "latitudeE7": 377700000}, {"timestampMs": "17000',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="Malformed location records"):
+        _route(_load_json_documents(tmp_path / "Takeout"))
+
+
+@pytest.mark.parametrize("use_ciso8601", [True, False])
+def test_parse_iso_normalizes_to_naive_utc(monkeypatch: pytest.MonkeyPatch, use_ciso8601: bool) -> None:
+    if use_ciso8601:
+        pytest.importorskip("ciso8601")
+    else:
+        monkeypatch.setattr(google_takeout_focused, "_ciso_parse_datetime", None)
+
+    assert _parse_iso("2024-01-10T10:00:00.000Z") == datetime(2024, 1, 10, 10, 0)
+    assert _parse_iso("2024-01-10T12:00:00+02:00") == datetime(2024, 1, 10, 10, 0)
+    assert _parse_iso("2024-01-10T10:00:00") == datetime(2024, 1, 10, 10, 0)
+    assert _parse_iso(None) is None
+
+
+def test_search_ids_and_payload_share_canonical_json() -> None:
+    item = {"title": "Searched for café", "time": "2024-03-01T00:00:00Z", "products": ["Search"]}
+    docs = [JsonDocument(logical_path="My Activity/Search/MyActivity.json", payload=[item])]
+
+    row = _route(docs)[2][0]
+
+    # Pinned so changes to id derivation cannot silently re-key curated data.
+    assert row["search_id"] == "search-b874fb329f034dd3"
+    assert json.loads(row["payload"]) == item
+
+
+def test_copy_raw_archive_copies_once(tmp_path: Path) -> None:
+    source = tmp_path / "takeout-001.zip"
+    source.write_bytes(b"zip bytes")
+    raw_root = tmp_path / "raw"
+
+    copied = _copy_raw_archive(source, raw_root)
+    source.write_bytes(b"changed")
+
+    assert copied == raw_root / "google_takeout" / "archives" / "takeout-001.zip"
+    assert _copy_raw_archive(source, raw_root) == copied
+    assert copied.read_bytes() == b"zip bytes"
+    assert [path.name for path in copied.parent.iterdir()] == ["takeout-001.zip"]
+
+
+def test_partitioned_parquet_sink_appends_batches_to_one_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(google_takeout_focused, "_WRITE_BATCH_ROWS", 2)
+    rows = [{"event_id": str(day), "event_ts": datetime(2024, 2, day), "payload": "{}"} for day in range(1, 6)]
+
+    with _PartitionedParquetSink(
+        dataset_root=tmp_path / "events",
+        source_token="token",
+        columns=[("event_id", "VARCHAR"), ("event_ts", "TIMESTAMP"), ("payload", "JSON")],
+        ts_column="event_ts",
+        payload_root=tmp_path / "events_payload",
+    ) as sink:
+        for row in rows:
+            sink.append(row)
+
+    assert sink.written == 5
+    main_file = pq.ParquetFile(tmp_path / "events" / "year=2024" / "month=02" / "token.parquet")
+    assert main_file.metadata.num_row_groups == 3
+    assert main_file.read().column("event_id").to_pylist() == ["1", "2", "3", "4", "5"]
+    payload = pq.read_table(tmp_path / "events_payload" / "year=2024" / "month=02" / "token.parquet")
+    assert payload.column_names == ["event_id", "payload"]
+    assert payload.num_rows == 5
+
+
+def test_partitioned_parquet_sink_discards_files_on_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(google_takeout_focused, "_WRITE_BATCH_ROWS", 2)
+    rows = [{"event_id": str(day), "event_ts": datetime(2024, 2, day)} for day in range(1, 4)]
+
+    with (
+        pytest.raises(ValueError, match="extraction failed"),
+        _PartitionedParquetSink(
+            dataset_root=tmp_path,
+            source_token="token",
+            columns=[("event_id", "VARCHAR"), ("event_ts", "TIMESTAMP")],
+            ts_column="event_ts",
+        ) as sink,
+    ):
+        for row in rows:
+            sink.append(row)
+        raise ValueError("extraction failed")
+
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+
 def test_guide_mentions_scope_and_exclusions(capsys) -> None:
     _print_guide()
     output = capsys.readouterr().out
@@ -6,12 +6,15 @@ from pathlib import Path
 import yaml
 
 from .database import connect, init_db
-from .runner import run_enrichment, run_with_audit
+from .runner import refresh_place_dim, run_enrichment, run_with_audit
+
+# libyaml's loader when PyYAML was built with it; same safe semantics either way.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 def _load_config(path: str) -> dict:
     with Path(path).open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
 
 
 def main() -> None:
@@ -40,7 +43,7 @@ def main() -> None:
     cfg = _load_config(args.config)
     db_path = cfg["db_path"]
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    conn = connect(db_path)
+    conn = connect(db_path, cfg.get("duckdb"))
     init_db(conn)
 
     if args.command == "run-source":
@@ -50,17 +53,22 @@ def main() -> None:
             return
         raw_count, visit_count, saved_count, review_count = run_with_audit(conn, args.source, source_cfg)
         print(f"{args.source}: raw={raw_count} visits={visit_count} saved={saved_count} reviews={review_count}")
+        refresh_place_dim(conn)
         enriched = run_enrichment(conn, cfg.get("enrichment", {}))
         if enriched:
             print(f"google_places enriched={enriched}")
         return
 
     if args.command == "run-all":
-        for source_name, source_cfg in cfg.get("sources", {}).items():
-            if not source_cfg.get("enabled", False):
-                continue
-            raw_count, visit_count, saved_count, review_count = run_with_audit(conn, source_name, source_cfg)
-            print(f"{source_name}: raw={raw_count} visits={visit_count} saved={saved_count} reviews={review_count}")
+        try:
+            for source_name, source_cfg in cfg.get("sources", {}).items():
+                if not source_cfg.get("enabled", False):
+                    continue
+                raw_count, visit_count, saved_count, review_count = run_with_audit(conn, source_name, source_cfg)
+                print(f"{source_name}: raw={raw_count} visits={visit_count} saved={saved_count} reviews={review_count}")
+        finally:
+            # Sources commit one by one, so a later failure must not leave place_dim behind the earlier ones.
+            refresh_place_dim(conn)
 
         enriched = run_enrichment(conn, cfg.get("enrichment", {}))
         if enriched:
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
+import json
+from typing import Any
+
 import duckdb
+import pyarrow as pa
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
 
 DDL = """
 create table if not exists ingestion_runs (
@@ -87,9 +96,42 @@ create table if not exists place_enrichment_google (
 """
 
 
-def connect(db_path: str) -> duckdb.DuckDBPyConnection:
-    return duckdb.connect(db_path)
+def connect(db_path: str, settings: dict[str, Any] | None = None) -> duckdb.DuckDBPyConnection:
+    """Open ``db_path``, applying optional DuckDB settings such as ``threads`` or ``memory_limit``.
+
+    Unset keys keep DuckDB's defaults (all cores, 80% of RAM).
+    """
+    return duckdb.connect(db_path, config={key: value for key, value in (settings or {}).items() if value is not None})
 
 
 def init_db(conn: duckdb.DuckDBPyConnection) -> None:
     conn.execute(DDL)
+
+
+def json_text(value: Any) -> str:
+    """Serialize a payload to compact JSON text once, ahead of binding."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def insert_columns(
+    conn: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: tuple[tuple[str, str], ...],
+    values: dict[str, list[Any]],
+) -> None:
+    """Insert per-column ``values`` into ``table`` as one Arrow-backed ``insert ... select``.
+
+    ``columns`` lists ``(name, arrow type alias)`` pairs in insert order. Binding rows one at
+    a time through ``executemany`` is dominated by per-parameter conversion overhead;
+    registering a single Arrow table lets DuckDB scan it in bulk.
+    """
+    column_list = ", ".join(name for name, _ in columns)
+    schema = pa.schema([(name, pa.type_for_alias(alias)) for name, alias in columns])
+    view_name = f"_tmp_{table}"
+    conn.register(view_name, pa.Table.from_pydict(values, schema=schema))
+    try:
+        conn.execute(f"insert into {table} ({column_list}) select * from {view_name}")
+    finally:
+        conn.unregister(view_name)
@@ -1,68 +1,90 @@
 from __future__ import annotations
 
+import logging
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
 
 import duckdb
 import requests
 
+from ..database import insert_columns, json_text
+from ..http_session import build_session
 
-def enrich_places(conn: duckdb.DuckDBPyConnection, api_key_env: str, max_rows_per_run: int) -> int:
+_LOGGER = logging.getLogger(__name__)
+
+_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+_DETAILS_FIELDS = "place_id,name,formatted_address,rating,user_ratings_total,types,geometry"
+
+_ENRICHMENT_COLUMNS = (
+    ("place_id", "string"),
+    ("fetched_at", "timestamp[us]"),
+    ("formatted_address", "string"),
+    ("rating", "double"),
+    ("user_ratings_total", "int32"),
+    ("primary_type", "string"),
+    ("payload", "string"),
+)
+
+# Shared across fetches (and worker threads) so keep-alive connections skip repeat TLS handshakes.
+_SESSION = build_session()
+
+
+def enrich_places(
+    conn: duckdb.DuckDBPyConnection, api_key_env: str, max_rows_per_run: int, max_workers: int = 8
+) -> int:
     api_key = os.getenv(api_key_env)
     if not api_key:
         return 0
 
     rows = conn.execute(
         """
-        select distinct place_id
-        from visits
-        where place_id is not null
-          and place_id not in (select place_id from place_enrichment_google)
+        select distinct v.place_id
+        from visits v
+        left join place_enrichment_google e using (place_id)
+        where v.place_id is not null
+          and e.place_id is null
         limit ?
         """,
         [max_rows_per_run],
     ).fetchall()
 
-    inserted = 0
-    for (place_id,) in rows:
-        payload = _fetch_place_details(place_id, api_key)
+    base_params = {"fields": _DETAILS_FIELDS, "key": api_key}
+    # Lookups are network-bound, so overlap them; max_workers also caps concurrent API requests.
+    place_ids = [place_id for (place_id,) in rows]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        payloads = list(pool.map(lambda place_id: _fetch_place_details(place_id, base_params), place_ids))
+
+    # One timestamp for the whole batch: cheaper than a clock read per row and compresses to a single run.
+    fetched_at = datetime.now(UTC).replace(tzinfo=None)
+    values: dict[str, list] = {name: [] for name, _ in _ENRICHMENT_COLUMNS}
+    for place_id, payload in zip(place_ids, payloads, strict=True):
         if not payload:
             continue
         result = payload.get("result", {})
-        conn.execute(
-            """
-            insert into place_enrichment_google (
-                place_id, fetched_at, formatted_address, rating, user_ratings_total, primary_type, payload
-            ) values (?, ?, ?, ?, ?, ?, ?)
-            """,
-            [
-                place_id,
-                datetime.utcnow(),
-                result.get("formatted_address"),
-                result.get("rating"),
-                result.get("user_ratings_total"),
-                (result.get("types") or [None])[0],
-                payload,
-            ],
-        )
-        inserted += 1
-    return inserted
+        values["place_id"].append(place_id)
+        values["fetched_at"].append(fetched_at)
+        values["formatted_address"].append(result.get("formatted_address"))
+        values["rating"].append(result.get("rating"))
+        values["user_ratings_total"].append(result.get("user_ratings_total"))
+        values["primary_type"].append((result.get("types") or [None])[0])
+        values["payload"].append(json_text(payload))
+
+    if values["place_id"]:
+        insert_columns(conn, "place_enrichment_google", _ENRICHMENT_COLUMNS, values)
+    return len(values["place_id"])
 
 
-def _fetch_place_details(place_id: str, api_key: str) -> dict | None:
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
-    response = requests.get(
-        url,
-        params={
-            "place_id": place_id,
-            "fields": "place_id,name,formatted_address,rating,user_ratings_total,types,geometry",
-            "key": api_key,
-        },
-        timeout=30,
-    )
-    if not response.ok:
+def _fetch_place_details(place_id: str, base_params: dict[str, str]) -> dict | None:
+    # A failed lookup only skips its own place; raising here would discard the whole batch.
+    try:
+        response = _SESSION.get(_DETAILS_URL, params={**base_params, "place_id": place_id}, timeout=30)
+        if not response.ok:
+            return None
+        data = response.json()
+    except (requests.RequestException, ValueError) as exc:
+        _LOGGER.warning("Google Places lookup failed for %s: %s", place_id, exc)
         return None
-    data = response.json()
     if data.get("status") not in {"OK", "ZERO_RESULTS"}:
         return None
     return data
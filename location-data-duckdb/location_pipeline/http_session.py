@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_size: int = 16) -> requests.Session:
+    """Return a keep-alive session sized for concurrent workers that retries transient failures.
+
+    Rate limits (429) and 5xx responses are retried with exponential backoff; once retries
+    are exhausted the last response is returned, so callers still see ``response.ok`` false.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
+from datetime import UTC, datetime
+from operator import attrgetter
 from uuid import uuid4
 
 import duckdb
 
+from .database import insert_columns, json_text
 from .enrich.google_places import enrich_places
 from .sources.foursquare_api import load_foursquare_api
 from .sources.foursquare_export import load_foursquare_export
@@ -55,12 +57,15 @@ def run_source(conn: duckdb.DuckDBPyConnection, source_name: str, source_cfg: di
 
 def run_with_audit(conn: duckdb.DuckDBPyConnection, source_name: str, source_cfg: dict) -> tuple[int, int, int, int]:
     run_id = str(uuid4())
-    started = datetime.utcnow()
+    started = _utcnow()
     conn.execute(
         "insert into ingestion_runs (run_id, source_name, started_at, status, message) values (?, ?, ?, ?, ?)",
         [run_id, source_name, started, "running", None],
     )
 
+    # The source's inserts and its success mark commit together in one transaction, so a
+    # failed run leaves no partial rows behind and pays a single commit instead of one per insert.
+    conn.begin()
     try:
         raw_count, visit_count, saved_count, review_count = run_source(conn, source_name, source_cfg)
         conn.execute(
@@ -70,24 +75,33 @@ def run_with_audit(conn: duckdb.DuckDBPyConnection, source_name: str, source_cfg
             where run_id = ?
             """,
             [
-                datetime.utcnow(),
+                _utcnow(),
                 "success",
                 f"raw={raw_count}, visits={visit_count}, saved={saved_count}, reviews={review_count}",
                 run_id,
             ],
         )
-        _refresh_place_dim(conn)
+        conn.commit()
         return raw_count, visit_count, saved_count, review_count
     except (ValueError, OSError, duckdb.Error) as exc:
+        conn.rollback()
         conn.execute(
             """
             update ingestion_runs
             set finished_at = ?, status = ?, message = ?
             where run_id = ?
             """,
-            [datetime.utcnow(), "failed", str(exc), run_id],
+            [_utcnow(), "failed", str(exc), run_id],
         )
         raise
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the naive-UTC timestamp columns."""
+    return datetime.now(UTC).replace(tzinfo=None)
 
 
 def run_enrichment(conn: duckdb.DuckDBPyConnection, enrichment_cfg: dict) -> int:
@@ -98,109 +112,95 @@ def run_enrichment(conn: duckdb.DuckDBPyConnection, enrichment_cfg: dict) -> int
         conn=conn,
         api_key_env=google_cfg.get("api_key_env", "GOOGLE_PLACES_API_KEY"),
         max_rows_per_run=int(google_cfg.get("max_rows_per_run", 200)),
+        max_workers=int(google_cfg.get("max_workers", 8)),
     )
 
 
+# Column order and Arrow type aliases for each ingest table, matching database.DDL;
+# payloads are inserted as JSON text.
+_RAW_EVENT_COLUMNS = (
+    ("event_id", "string"),
+    ("source_name", "string"),
+    ("event_ts", "timestamp[us]"),
+    ("lat", "double"),
+    ("lon", "double"),
+    ("place_id", "string"),
+    ("payload", "string"),
+)
+
+_VISIT_COLUMNS = (
+    ("visit_id", "string"),
+    ("source_name", "string"),
+    ("started_at", "timestamp[us]"),
+    ("ended_at", "timestamp[us]"),
+    ("lat", "double"),
+    ("lon", "double"),
+    ("place_name", "string"),
+    ("place_id", "string"),
+    ("list_name", "string"),
+    ("confidence", "double"),
+    ("payload", "string"),
+)
+
+_SAVED_PLACE_COLUMNS = (
+    ("saved_id", "string"),
+    ("source_name", "string"),
+    ("saved_at", "timestamp[us]"),
+    ("place_name", "string"),
+    ("place_id", "string"),
+    ("lat", "double"),
+    ("lon", "double"),
+    ("list_name", "string"),
+    ("notes", "string"),
+    ("payload", "string"),
+)
+
+_REVIEW_COLUMNS = (
+    ("review_id", "string"),
+    ("source_name", "string"),
+    ("created_at", "timestamp[us]"),
+    ("place_name", "string"),
+    ("place_id", "string"),
+    ("rating", "double"),
+    ("review_text", "string"),
+    ("payload", "string"),
+)
+
+
 def _insert_raw_events(conn: duckdb.DuckDBPyConnection, records: list) -> None:
-    if not records:
-        return
-    conn.executemany(
-        """
-        insert into raw_events (event_id, source_name, event_ts, lat, lon, place_id, payload)
-        values (?, ?, ?, ?, ?, ?, ?)
-        """,
-        [[r.event_id, r.source_name, r.event_ts, r.lat, r.lon, r.place_id, r.payload] for r in records],
-    )
+    _insert_records(conn, "raw_events", _RAW_EVENT_COLUMNS, records)
 
 
 def _insert_visits(conn: duckdb.DuckDBPyConnection, records: list) -> None:
-    if not records:
-        return
-    conn.executemany(
-        """
-        insert into visits (
-            visit_id, source_name, started_at, ended_at, lat, lon,
-            place_name, place_id, list_name, confidence, payload
-        ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        [
-            [
-                r.visit_id,
-                r.source_name,
-                r.started_at,
-                r.ended_at,
-                r.lat,
-                r.lon,
-                r.place_name,
-                r.place_id,
-                r.list_name,
-                r.confidence,
-                r.payload,
-            ]
-            for r in records
-        ],
-    )
+    _insert_records(conn, "visits", _VISIT_COLUMNS, records)
 
 
 def _insert_saved_places(conn: duckdb.DuckDBPyConnection, records: list) -> None:
-    if not records:
-        return
-    conn.executemany(
-        """
-        insert into saved_places (
-            saved_id, source_name, saved_at, place_name, place_id,
-            lat, lon, list_name, notes, payload
-        ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        [
-            [
-                r.saved_id,
-                r.source_name,
-                r.saved_at,
-                r.place_name,
-                r.place_id,
-                r.lat,
-                r.lon,
-                r.list_name,
-                r.notes,
-                r.payload,
-            ]
-            for r in records
-        ],
-    )
+    _insert_records(conn, "saved_places", _SAVED_PLACE_COLUMNS, records)
 
 
 def _insert_reviews(conn: duckdb.DuckDBPyConnection, records: list) -> None:
+    _insert_records(conn, "place_reviews", _REVIEW_COLUMNS, records)
+
+
+def _insert_records(
+    conn: duckdb.DuckDBPyConnection, table: str, columns: tuple[tuple[str, str], ...], records: list
+) -> None:
     if not records:
         return
-    conn.executemany(
-        """
-        insert into place_reviews (
-            review_id, source_name, created_at, place_name, place_id,
-            rating, review_text, payload
-        ) values (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        [
-            [
-                r.review_id,
-                r.source_name,
-                r.created_at,
-                r.place_name,
-                r.place_id,
-                r.rating,
-                r.review_text,
-                r.payload,
-            ]
-            for r in records
-        ],
-    )
+    names = [name for name, _ in columns]
+    # One C-level attrgetter call per record pulls every field at once; zip(*...) then
+    # transposes the rows into the per-column lists Arrow consumes.
+    values = dict(zip(names, map(list, zip(*map(attrgetter(*names), records), strict=True)), strict=True))
+    values["payload"] = list(map(json_text, values["payload"]))
+    insert_columns(conn, table, columns, values)
 
 
-def _refresh_place_dim(conn: duckdb.DuckDBPyConnection) -> None:
-    conn.execute("delete from place_dim")
+def refresh_place_dim(conn: duckdb.DuckDBPyConnection) -> None:
+    """Rebuild place_dim from visits and saved_places; call once after a batch of runs."""
     conn.execute(
         """
-        insert into place_dim
+        create or replace table place_dim as
         with all_places as (
             select source_name, place_id, place_name, lat, lon, started_at as event_ts from visits
             union all
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import mmap
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None  # type: ignore[assignment]
+
+
+def loads(data: bytes) -> Any:
+    """Parse raw JSON bytes, with orjson when installed (its errors are ValueErrors too)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_file(path: Path) -> Any:
+    """Parse a whole JSON file.
+
+    With orjson the parser reads straight from a read-only memory map, so the file is never
+    copied into an intermediate ``bytes`` object on top of the parsed tree.
+    """
+    if orjson is None or path.stat().st_size == 0:
+        return loads(path.read_bytes())
+    with (
+        path.open("rb") as fp,
+        mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        memoryview(mapped) as view,
+    ):
+        return orjson.loads(view)
+
+
+def write_json(path: Path, value: Any) -> None:
+    """Write ``value`` as sorted, indented JSON, replacing ``path`` atomically."""
+    if orjson is not None:
+        data = orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(value, sort_keys=True, indent=2).encode("utf-8")
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def iter_json_items(path: Path, prefix: str) -> Iterator[Any]:
+    """Yield the elements of the array at ``prefix`` (ijson syntax, e.g. ``"locations.item"``).
+
+    With ijson installed the file is streamed, so a multi-GB export never exists as one
+    string plus one parsed tree. Missing keys or a non-array target yield nothing; malformed
+    JSON raises ``ValueError`` either way.
+    """
+    if ijson is not None:
+        with path.open("rb") as fp:
+            try:
+                yield from ijson.items(fp, prefix, use_float=True)
+            except ijson.JSONError as exc:
+                raise ValueError(f"{path}: {exc}") from exc
+        return
+
+    data: Any = load_file(path)
+    for key in prefix.split(".")[:-1]:
+        data = data.get(key) if isinstance(data, dict) else None
+    if isinstance(data, list):
+        yield from data
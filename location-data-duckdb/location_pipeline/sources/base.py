@@ -5,7 +5,7 @@ from datetime import datetime
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class VisitRecord:
     visit_id: str
     source_name: str
@@ -20,7 +20,7 @@ class VisitRecord:
     payload: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class RawEventRecord:
     event_id: str
     source_name: str
@@ -31,7 +31,7 @@ class RawEventRecord:
     payload: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class SavedPlaceRecord:
     saved_id: str
     source_name: str
@@ -45,7 +45,7 @@ class SavedPlaceRecord:
     payload: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class PlaceReviewRecord:
     review_id: str
     source_name: str
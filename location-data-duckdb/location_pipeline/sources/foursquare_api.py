@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+from ..http_session import build_session
 from .base import PlaceReviewRecord, SavedPlaceRecord, VisitRecord
 
+_LIST_FETCH_WORKERS = 8
+
+# Shared so every call (including list fetches on worker threads) reuses keep-alive connections.
+_SESSION = build_session()
+
 
 def load_foursquare_api(
     oauth_token: str,
@@ -30,7 +43,7 @@ def _fetch_checkins(oauth_token: str, api_version: str, limit: int) -> list[Visi
         api_version,
         {"limit": limit},
     )
-    items = (((data or {}).get("response") or {}).get("checkins") or {}).get("items") or []
+    items = _dig(data, "response", "checkins", "items") or []
     results: list[VisitRecord] = []
     for item in items:
         venue = item.get("venue", {})
@@ -55,42 +68,49 @@ def _fetch_checkins(oauth_token: str, api_version: str, limit: int) -> list[Visi
 
 def _fetch_saved_places(oauth_token: str, api_version: str) -> list[SavedPlaceRecord]:
     data = _get("https://api.foursquare.com/v2/users/self/lists", oauth_token, api_version)
-    lists = (((data or {}).get("response") or {}).get("lists") or {}).get("groups") or []
+    lists = _dig(data, "response", "lists", "groups") or []
     records: list[SavedPlaceRecord] = []
 
-    for group in lists:
-        for user_list in group.get("items", []):
-            list_name = user_list.get("name")
-            list_id = user_list.get("id")
-            list_data = _get(
-                f"https://api.foursquare.com/v2/lists/{list_id}",
-                oauth_token,
-                api_version,
+    user_lists = [user_list for group in lists for user_list in group.get("items", [])]
+    # Each list is a separate request; fetch them concurrently rather than paying one RTT per list.
+    with ThreadPoolExecutor(max_workers=_LIST_FETCH_WORKERS) as pool:
+        list_payloads = list(
+            pool.map(
+                lambda user_list: _get(
+                    f"https://api.foursquare.com/v2/lists/{user_list.get('id')}",
+                    oauth_token,
+                    api_version,
+                ),
+                user_lists,
             )
-            entries = ((((list_data or {}).get("response") or {}).get("list") or {}).get("listItems") or {}).get("items") or []
-            for entry in entries:
-                venue = (entry.get("venue") or {})
-                loc = venue.get("location", {})
-                records.append(
-                    SavedPlaceRecord(
-                        saved_id=str(entry.get("id") or f"foursquare-saved-{len(records)}"),
-                        source_name="foursquare_api",
-                        saved_at=_from_unix(entry.get("createdAt")),
-                        place_name=venue.get("name"),
-                        place_id=venue.get("id"),
-                        lat=_safe_float(loc.get("lat")),
-                        lon=_safe_float(loc.get("lng")),
-                        list_name=list_name,
-                        notes=(entry.get("note") or {}).get("text"),
-                        payload=entry,
-                    )
+        )
+
+    for user_list, list_data in zip(user_lists, list_payloads, strict=True):
+        list_name = user_list.get("name")
+        entries = _dig(list_data, "response", "list", "listItems", "items") or []
+        for entry in entries:
+            venue = (entry.get("venue") or {})
+            loc = venue.get("location", {})
+            records.append(
+                SavedPlaceRecord(
+                    saved_id=str(entry.get("id") or f"foursquare-saved-{len(records)}"),
+                    source_name="foursquare_api",
+                    saved_at=_from_unix(entry.get("createdAt")),
+                    place_name=venue.get("name"),
+                    place_id=venue.get("id"),
+                    lat=_safe_float(loc.get("lat")),
+                    lon=_safe_float(loc.get("lng")),
+                    list_name=list_name,
+                    notes=(entry.get("note") or {}).get("text"),
+                    payload=entry,
                 )
+            )
     return records
 
 
 def _fetch_tips(oauth_token: str, api_version: str) -> list[PlaceReviewRecord]:
     data = _get("https://api.foursquare.com/v2/users/self/tips", oauth_token, api_version)
-    tips = (((data or {}).get("response") or {}).get("tips") or {}).get("items") or []
+    tips = _dig(data, "response", "tips", "items") or []
     results: list[PlaceReviewRecord] = []
     for tip in tips:
         venue = tip.get("venue", {})
@@ -114,14 +134,25 @@ def _get(url: str, oauth_token: str, api_version: str, extra_params: dict | None
     if extra_params:
         params.update(extra_params)
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         if not response.ok:
             return None
+        if orjson is not None:
+            return orjson.loads(response.content)
         return response.json()
-    except requests.RequestException:
+    except (requests.RequestException, ValueError):
         return None
 
 
+def _dig(data: Any, *keys: str) -> Any:
+    """Walk nested response dicts, returning None as soon as a level is missing."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
 def _from_unix(value: int | str | None) -> datetime | None:
     if value is None:
         return None
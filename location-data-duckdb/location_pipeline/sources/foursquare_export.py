@@ -1,16 +1,30 @@
 from __future__ import annotations
 
 import csv
-import json
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import requests
 
+from ..http_session import build_session
+from ._json import iter_json_items, load_file, write_json
 from .base import VisitRecord
 
+_PLACES_FETCH_WORKERS = 8
+
+# Column aliases seen across Foursquare/Swarm export versions, in priority order.
+_LAT_KEYS = ("latitude", "lat")
+_LON_KEYS = ("longitude", "lon", "lng")
+_TIME_KEYS = ("created_at", "timestamp")
+_NAME_KEYS = ("venue_name", "name")
+_PLACE_ID_KEYS = ("venue_id", "place_id")
+
+# Shared across venue lookups (and worker threads) so keep-alive connections skip repeat TLS handshakes.
+_SESSION = build_session()
+
 
 def load_foursquare_export(
     base_path: str,
@@ -24,21 +38,29 @@ def load_foursquare_export(
     visits: list[VisitRecord] = []
 
     for csv_path in root.rglob("*.csv"):
-        with csv_path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                lat = _safe_float(row.get("latitude") or row.get("lat"))
-                lon = _safe_float(row.get("longitude") or row.get("lon") or row.get("lng"))
+        with csv_path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                continue
+            for values in reader:
+                if not values:
+                    continue
+                # Cheaper than DictReader's per-row bookkeeping; the dict is still built because
+                # it is stored as the payload and later enriched in place.
+                row = dict(zip(header, values, strict=False))
+                lat = _safe_float(_first(row, _LAT_KEYS))
+                lon = _safe_float(_first(row, _LON_KEYS))
                 visits.append(
                     VisitRecord(
                         visit_id=row.get("checkin_id") or f"foursquare-csv-{len(visits)}",
                         source_name="foursquare_export",
-                        started_at=_safe_dt(row.get("created_at") or row.get("timestamp")),
+                        started_at=_safe_dt(_first(row, _TIME_KEYS)),
                         ended_at=None,
                         lat=lat,
                         lon=lon,
-                        place_name=row.get("venue_name") or row.get("name"),
-                        place_id=row.get("venue_id") or row.get("place_id"),
+                        place_name=_first(row, _NAME_KEYS),
+                        place_id=_first(row, _PLACE_ID_KEYS),
                         list_name=row.get("list_name"),
                         confidence=None,
                         payload=row,
@@ -46,22 +68,19 @@ def load_foursquare_export(
                 )
 
     for json_path in root.rglob("*.json"):
-        data = json.loads(json_path.read_text(encoding="utf-8"))
-        if not isinstance(data, list):
-            continue
-        for row in data:
+        for row in iter_json_items(json_path, "item"):
             if not isinstance(row, dict):
                 continue
             visits.append(
                 VisitRecord(
                     visit_id=str(row.get("checkin_id") or f"foursquare-json-{len(visits)}"),
                     source_name="foursquare_export",
-                    started_at=_safe_dt(row.get("created_at") or row.get("timestamp")),
+                    started_at=_safe_dt(_first(row, _TIME_KEYS)),
                     ended_at=None,
-                    lat=_safe_float(row.get("latitude") or row.get("lat")),
-                    lon=_safe_float(row.get("longitude") or row.get("lon") or row.get("lng")),
-                    place_name=row.get("venue_name") or row.get("name"),
-                    place_id=row.get("venue_id") or row.get("place_id"),
+                    lat=_safe_float(_first(row, _LAT_KEYS)),
+                    lon=_safe_float(_first(row, _LON_KEYS)),
+                    place_name=_first(row, _NAME_KEYS),
+                    place_id=_first(row, _PLACE_ID_KEYS),
                     list_name=row.get("list_name"),
                     confidence=None,
                     payload=row,
@@ -73,22 +92,38 @@ def load_foursquare_export(
 
     cache_file = Path(cache_path) if cache_path else (root / ".foursquare_places_cache.json")
     venue_cache = _load_cache(cache_file)
-    _enrich_with_places_api(
+    fetched_count = _enrich_with_places_api(
         visits=visits,
         places_api_key=places_api_key,
         places_api_base_url=places_api_base_url,
         request_timeout_seconds=request_timeout_seconds,
         venue_cache=venue_cache,
     )
-    _save_cache(cache_file, venue_cache)
+    if fetched_count:
+        # Rewriting the whole cache is O(cache size); skip it when every venue was a cache hit.
+        _save_cache(cache_file, venue_cache)
     return visits
 
 
+def _first(row: Mapping[str, Any], keys: tuple[str, ...]) -> Any:
+    """Return the first value under ``keys`` that is neither missing nor empty.
+
+    Unlike chaining ``or``, a numeric ``0`` (e.g. a coordinate on the equator) counts as present.
+    """
+    for key in keys:
+        value = row.get(key)
+        if value is not None and value != "":
+            return value
+    return None
+
+
 def _safe_dt(value: str | None) -> datetime | None:
     if not value:
         return None
     try:
-        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+        if value[-1] == "Z":
+            return datetime.fromisoformat(value[:-1])
+        return datetime.fromisoformat(value).replace(tzinfo=None)
     except ValueError:
         return None
 
@@ -108,22 +143,28 @@ def _enrich_with_places_api(
     places_api_base_url: str,
     request_timeout_seconds: float,
     venue_cache: dict[str, dict[str, Any]],
-) -> None:
-    for visit in visits:
-        if (visit.lat is not None and visit.lon is not None) or not visit.place_id:
-            continue
-
-        venue_id = visit.place_id
-        cached = venue_cache.get(venue_id)
-        if cached is None:
-            cached = _fetch_venue_location(
-                venue_id=venue_id,
-                places_api_key=places_api_key,
-                places_api_base_url=places_api_base_url,
-                request_timeout_seconds=request_timeout_seconds,
+) -> int:
+    """Fill missing visit coordinates from the Places API; returns how many venues were fetched."""
+    pending = [visit for visit in visits if (visit.lat is None or visit.lon is None) and visit.place_id]
+
+    # Lookups are network-bound: fetch each uncached venue once, concurrently, then apply
+    # the results on this thread so the cache and records are only mutated serially.
+    missing = list(dict.fromkeys(visit.place_id for visit in pending if visit.place_id not in venue_cache))
+    if missing:
+        with ThreadPoolExecutor(max_workers=_PLACES_FETCH_WORKERS) as pool:
+            fetched = pool.map(
+                lambda venue_id: _fetch_venue_location(
+                    venue_id=venue_id,
+                    places_api_key=places_api_key,
+                    places_api_base_url=places_api_base_url,
+                    request_timeout_seconds=request_timeout_seconds,
+                ),
+                missing,
             )
-            venue_cache[venue_id] = cached
+            venue_cache.update(zip(missing, fetched, strict=True))
 
+    for visit in pending:
+        cached = venue_cache[visit.place_id]
         if visit.lat is None:
             visit.lat = _safe_float(cached.get("lat"))
         if visit.lon is None:
@@ -134,6 +175,7 @@ def _enrich_with_places_api(
             location = visit.payload["venue_location"]
             if isinstance(location, dict):
                 location.update(cached)
+    return len(missing)
 
 
 def _fetch_venue_location(
@@ -148,7 +190,7 @@ def _fetch_venue_location(
         "accept": "application/json",
     }
     try:
-        response = requests.get(url, headers=headers, timeout=request_timeout_seconds)
+        response = _SESSION.get(url, headers=headers, timeout=request_timeout_seconds)
         if not response.ok:
             return {}
         data = response.json()
@@ -185,7 +227,7 @@ def _load_cache(cache_path: Path) -> dict[str, dict[str, Any]]:
     if not cache_path.exists():
         return {}
     try:
-        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        data = load_file(cache_path)
     except (OSError, ValueError):
         return {}
     if not isinstance(data, dict):
@@ -199,4 +241,4 @@ def _load_cache(cache_path: Path) -> dict[str, dict[str, Any]]:
 
 def _save_cache(cache_path: Path, cache: dict[str, dict[str, Any]]) -> None:
     cache_path.parent.mkdir(parents=True, exist_ok=True)
-    cache_path.write_text(json.dumps(cache, ensure_ascii=True, sort_keys=True, indent=2), encoding="utf-8")
+    write_json(cache_path, cache)
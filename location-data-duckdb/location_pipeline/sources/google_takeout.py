@@ -2,18 +2,25 @@ from __future__ import annotations
 
 import hashlib
 import json
-from datetime import UTC, datetime
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from ._json import iter_json_items
 from .base import RawEventRecord, VisitRecord
 
+_EPOCH = datetime(1970, 1, 1)
+_SEMANTIC_DIR = "Semantic Location History"
+_SEMANTIC_LOAD_WORKERS = 8
+
 
 def _parse_ts_millis(value: str | int | None) -> datetime | None:
     if value is None:
         return None
-    millis = int(value)
-    return datetime.fromtimestamp(millis / 1000, tz=UTC).replace(tzinfo=None)
+    # Exact integer arithmetic on a naive epoch; no float division or tz round-trip per point.
+    return _EPOCH + timedelta(milliseconds=int(value))
 
 
 def _e7_to_float(value: int | None) -> float | None:
@@ -24,7 +31,8 @@ def _e7_to_float(value: int | None) -> float | None:
 
 def _stable_id(prefix: str, payload: Any) -> str:
     canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
-    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    # First 8 digest bytes == the first 16 hex chars, without hexing the whole digest.
+    digest = hashlib.sha256(canonical.encode("ascii"), usedforsecurity=False).digest()[:8].hex()
     return f"{prefix}-{digest}"
 
 
@@ -35,54 +43,84 @@ def load_google_takeout(base_path: str) -> tuple[list[RawEventRecord], list[Visi
 
     records_file = next(root.rglob("Records.json"), None)
     if records_file and records_file.exists():
-        payload = json.loads(records_file.read_text(encoding="utf-8"))
-        for item in payload.get("locations", []):
+        for item in iter_json_items(records_file, "locations.item"):
+            # Positional construction: Records.json can hold millions of points, and keyword
+            # binding roughly doubles the cost of each __init__ call.
             raw_events.append(
                 RawEventRecord(
-                    event_id=_stable_id("google-record", item),
-                    source_name="google_takeout",
-                    event_ts=_parse_ts_millis(item.get("timestampMs")),
-                    lat=_e7_to_float(item.get("latitudeE7")),
-                    lon=_e7_to_float(item.get("longitudeE7")),
-                    place_id=None,
-                    payload=item,
+                    _stable_id("google-record", item),  # event_id
+                    "google_takeout",  # source_name
+                    _parse_ts_millis(item.get("timestampMs")),  # event_ts
+                    _e7_to_float(item.get("latitudeE7")),  # lat
+                    _e7_to_float(item.get("longitudeE7")),  # lon
+                    None,  # place_id
+                    item,  # payload
                 )
             )
 
-    for path in root.rglob("*.json"):
-        if "Semantic Location History" not in str(path):
-            continue
-        data = json.loads(path.read_text(encoding="utf-8"))
-        for timeline_object in data.get("timelineObjects", []):
-            visit = timeline_object.get("placeVisit")
-            if not visit:
-                continue
-            location = visit.get("location", {})
-            duration = visit.get("duration", {})
-            visits.append(
-                VisitRecord(
-                    visit_id=_stable_id("google-visit", visit),
-                    source_name="google_takeout",
-                    started_at=_parse_iso(duration.get("startTimestamp")),
-                    ended_at=_parse_iso(duration.get("endTimestamp")),
-                    lat=location.get("latitudeE7", 0) / 1e7 if location.get("latitudeE7") else None,
-                    lon=location.get("longitudeE7", 0) / 1e7 if location.get("longitudeE7") else None,
-                    place_name=location.get("name"),
-                    place_id=location.get("placeId"),
-                    list_name=None,
-                    confidence=float(visit.get("visitConfidence", 0)) if visit.get("visitConfidence") else None,
-                    payload=visit,
-                )
-            )
+    for file_visits in _map_semantic_files(_semantic_history_files(root)):
+        visits.extend(file_visits)
 
     return raw_events, visits
 
 
+def _semantic_history_files(root: Path) -> list[Path]:
+    """JSON files under any Semantic Location History directory (or all of ``root`` if inside one).
+
+    Only those directories are walked for ``*.json``, instead of stringifying and filtering every
+    JSON path in the Takeout tree.
+    """
+    if any(_SEMANTIC_DIR in part for part in root.parts):
+        return list(root.rglob("*.json"))
+    directories = [path for path in root.rglob(f"*{_SEMANTIC_DIR}*") if path.is_dir()]
+    return list(dict.fromkeys(path for directory in directories for path in directory.rglob("*.json")))
+
+
+def _map_semantic_files(paths: list[Path]) -> Iterable[list[VisitRecord]]:
+    """Load each monthly Semantic Location History file, overlapping file reads on threads.
+
+    Threads keep the records in-process; a process pool pickled every ``VisitRecord`` back
+    to the parent and measured slower than a serial loop.
+    """
+    if len(paths) < 2:
+        return map(_load_semantic_visits, paths)
+    with ThreadPoolExecutor(max_workers=min(len(paths), _SEMANTIC_LOAD_WORKERS)) as pool:
+        return list(pool.map(_load_semantic_visits, paths))
+
+
+def _load_semantic_visits(path: Path) -> list[VisitRecord]:
+    visits: list[VisitRecord] = []
+    for timeline_object in iter_json_items(path, "timelineObjects.item"):
+        visit = timeline_object.get("placeVisit")
+        if not visit:
+            continue
+        location = visit.get("location", {})
+        duration = visit.get("duration", {})
+        visits.append(
+            VisitRecord(
+                visit_id=_stable_id("google-visit", visit),
+                source_name="google_takeout",
+                started_at=_parse_iso(duration.get("startTimestamp")),
+                ended_at=_parse_iso(duration.get("endTimestamp")),
+                lat=location.get("latitudeE7", 0) / 1e7 if location.get("latitudeE7") else None,
+                lon=location.get("longitudeE7", 0) / 1e7 if location.get("longitudeE7") else None,
+                place_name=location.get("name"),
+                place_id=location.get("placeId"),
+                list_name=None,
+                confidence=float(visit.get("visitConfidence", 0)) if visit.get("visitConfidence") else None,
+                payload=visit,
+            )
+        )
+    return visits
+
+
 def _parse_iso(value: str | None) -> datetime | None:
     if not value:
         return None
-    normalized = value.replace("Z", "+00:00")
-    dt = datetime.fromisoformat(normalized)
+    if value[-1] == "Z":
+        # Takeout's usual UTC form: parse the naive part directly, skipping the tz round-trip.
+        return datetime.fromisoformat(value[:-1])
+    dt = datetime.fromisoformat(value)
     if dt.tzinfo:
         dt = dt.astimezone(UTC).replace(tzinfo=None)
     return dt
@@ -13,9 +13,15 @@ def load_manual_csv(path: str) -> list[VisitRecord]:
         return []
 
     visits: list[VisitRecord] = []
-    with csv_path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    with csv_path.open("r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        for values in reader:
+            if not values:
+                continue
+            row = dict(zip(header, values, strict=False))
             visits.append(
                 VisitRecord(
                     visit_id=row.get("visit_id") or f"manual-{len(visits)}",
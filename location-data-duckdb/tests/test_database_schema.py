@@ -1,4 +1,4 @@
-from location_pipeline.database import init_db
+from location_pipeline.database import connect, init_db
 
 
 def test_schema_includes_behavior_tables(duckdb_conn) -> None:
@@ -18,3 +18,12 @@ def test_behavior_tables_are_separate(duckdb_conn) -> None:
     assert duckdb_conn.execute("select count(*) from visits").fetchone()[0] == 1
     assert duckdb_conn.execute("select count(*) from saved_places").fetchone()[0] == 1
     assert duckdb_conn.execute("select count(*) from place_reviews").fetchone()[0] == 1
+
+
+def test_connect_applies_duckdb_settings() -> None:
+    conn = connect(":memory:", {"threads": 2, "memory_limit": "1GB", "unused": None})
+    try:
+        assert conn.execute("select current_setting('threads')").fetchone()[0] == 2
+        assert conn.execute("select current_setting('memory_limit')").fetchone()[0] in {"1.0 GiB", "953.6 MiB"}
+    finally:
+        conn.close()
@@ -0,0 +1,29 @@
+from location_pipeline.sources.foursquare_api import _dig, _fetch_saved_places
+
+
+def test_saved_places_keep_list_order(monkeypatch) -> None:
+    def fake_get(url: str, _token: str, _version: str, _extra: dict | None = None) -> dict:
+        if url.endswith("/users/self/lists"):
+            groups = [{"items": [{"id": "a", "name": "Coffee"}, {"id": "b", "name": "Bars"}]}]
+            return {"response": {"lists": {"groups": groups}}}
+        list_id = url.rsplit("/", 1)[-1]
+        items = [{"id": f"{list_id}-1", "venue": {"id": f"venue-{list_id}", "location": {"lat": 1, "lng": 2}}}]
+        return {"response": {"list": {"listItems": {"items": items}}}}
+
+    monkeypatch.setattr("location_pipeline.sources.foursquare_api._get", fake_get)
+
+    records = _fetch_saved_places("token", "20240201")
+
+    assert [(r.saved_id, r.list_name, r.place_id, r.lat) for r in records] == [
+        ("a-1", "Coffee", "venue-a", 1.0),
+        ("b-1", "Bars", "venue-b", 1.0),
+    ]
+
+
+def test_dig_stops_at_missing_levels() -> None:
+    data = {"response": {"checkins": {"items": [1]}, "tips": None, "lists": []}}
+
+    assert _dig(data, "response", "checkins", "items") == [1]
+    assert _dig(data, "response", "tips", "items") is None
+    assert _dig(data, "response", "lists", "groups") is None
+    assert _dig(None, "response") is None
@@ -34,7 +34,7 @@ def test_enriches_missing_coords_and_uses_cache(monkeypatch, tmp_path: Path) ->
         assert timeout == 5.0
         return Response()
 
-    monkeypatch.setattr("location_pipeline.sources.foursquare_export.requests.get", fake_get)
+    monkeypatch.setattr("location_pipeline.sources.foursquare_export._SESSION.get", fake_get)
 
     visits = load_foursquare_export(
         str(tmp_path),
@@ -51,9 +51,10 @@ def test_enriches_missing_coords_and_uses_cache(monkeypatch, tmp_path: Path) ->
     assert cache_path.exists()
 
     def fail_get(*_args, **_kwargs):
-        raise AssertionError("network call should not be made when cache exists")
+        raise AssertionError("no network call or cache rewrite expected when every venue is cached")
 
-    monkeypatch.setattr("location_pipeline.sources.foursquare_export.requests.get", fail_get)
+    monkeypatch.setattr("location_pipeline.sources.foursquare_export._SESSION.get", fail_get)
+    monkeypatch.setattr("location_pipeline.sources.foursquare_export._save_cache", fail_get)
 
     cached_visits = load_foursquare_export(
         str(tmp_path),
@@ -78,7 +79,7 @@ def test_does_not_call_places_api_without_place_id(monkeypatch, tmp_path: Path)
         called["value"] = True
         raise AssertionError("request should not be sent")
 
-    monkeypatch.setattr("location_pipeline.sources.foursquare_export.requests.get", fake_get)
+    monkeypatch.setattr("location_pipeline.sources.foursquare_export._SESSION.get", fake_get)
 
     visits = load_foursquare_export(
         str(tmp_path),
@@ -90,3 +91,18 @@ def test_does_not_call_places_api_without_place_id(monkeypatch, tmp_path: Path)
     assert visits[0].lat is None
     assert visits[0].lon is None
     assert called["value"] is False
+
+
+def test_json_rows_resolve_column_aliases(tmp_path: Path) -> None:
+    (tmp_path / "checkins.json").write_text(
+        '[{"checkin_id": "j-1", "timestamp": "2024-10-22T10:00:00Z", "lat": 0, "lng": 12.5,'
+        ' "venue_name": "", "name": "Equator Cafe", "place_id": "p-1"}]',
+        encoding="utf-8",
+    )
+
+    visits = load_foursquare_export(str(tmp_path))
+
+    assert [(v.visit_id, v.lat, v.lon, v.place_name, v.place_id) for v in visits] == [
+        ("j-1", 0.0, 12.5, "Equator Cafe", "p-1")
+    ]
+    assert visits[0].started_at is not None
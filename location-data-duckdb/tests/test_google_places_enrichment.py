@@ -0,0 +1,67 @@
+import requests
+from location_pipeline.database import init_db
+from location_pipeline.enrich import google_places
+from location_pipeline.enrich.google_places import enrich_places
+
+
+def test_enriches_only_unseen_place_ids(duckdb_conn, monkeypatch) -> None:
+    init_db(duckdb_conn)
+    duckdb_conn.execute(
+        "insert into visits (visit_id, source_name, place_id) values "
+        "('v1', 'test', 'seen'), ('v2', 'test', 'new'), ('v3', 'test', 'new'), ('v4', 'test', null)"
+    )
+    # A null place_id in the enrichment table must not hide every candidate.
+    duckdb_conn.execute("insert into place_enrichment_google (place_id) values ('seen'), (null)")
+
+    fetched: list[str] = []
+
+    def fake_fetch(place_id: str, base_params: dict) -> dict:
+        assert base_params["key"] == "key"
+        fetched.append(place_id)
+        return {"status": "OK", "result": {"formatted_address": "1 Main St", "user_ratings_total": 12, "types": ["cafe"]}}
+
+    monkeypatch.setenv("TEST_PLACES_KEY", "key")
+    monkeypatch.setattr("location_pipeline.enrich.google_places._fetch_place_details", fake_fetch)
+
+    assert enrich_places(duckdb_conn, api_key_env="TEST_PLACES_KEY", max_rows_per_run=10) == 1
+    assert fetched == ["new"]
+    row = duckdb_conn.execute(
+        "select formatted_address, user_ratings_total, primary_type, payload->>'$.status' "
+        "from place_enrichment_google where place_id = 'new'"
+    ).fetchone()
+    assert row == ("1 Main St", 12, "cafe", "OK")
+
+
+class _FakeResponse:
+    ok = True
+
+    def __init__(self, payload: dict | None) -> None:
+        self._payload = payload
+
+    def json(self) -> dict:
+        if self._payload is None:
+            raise ValueError("not json")
+        return self._payload
+
+
+def test_failed_lookups_do_not_drop_successful_rows(duckdb_conn, monkeypatch) -> None:
+    init_db(duckdb_conn)
+    duckdb_conn.execute(
+        "insert into visits (visit_id, source_name, place_id) values "
+        "('v1', 'test', 'ok'), ('v2', 'test', 'timeout'), ('v3', 'test', 'garbled')"
+    )
+
+    def fake_get(url: str, params: dict, timeout: float) -> _FakeResponse:
+        if params["place_id"] == "timeout":
+            raise requests.ConnectionError("connection reset")
+        if params["place_id"] == "garbled":
+            return _FakeResponse(None)
+        return _FakeResponse({"status": "OK", "result": {"formatted_address": "1 Main St"}})
+
+    monkeypatch.setenv("TEST_PLACES_KEY", "key")
+    monkeypatch.setattr(google_places._SESSION, "get", fake_get)
+
+    assert enrich_places(duckdb_conn, api_key_env="TEST_PLACES_KEY", max_rows_per_run=10) == 1
+    assert duckdb_conn.execute("select place_id, formatted_address from place_enrichment_google").fetchall() == [
+        ("ok", "1 Main St")
+    ]
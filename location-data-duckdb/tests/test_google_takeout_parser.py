@@ -1,9 +1,18 @@
 from __future__ import annotations
 
 import json
+from datetime import datetime
 from pathlib import Path
 
-from location_pipeline.sources.google_takeout import _e7_to_float, _parse_ts_millis, load_google_takeout
+from location_pipeline.sources.google_takeout import (
+    _e7_to_float,
+    _load_semantic_visits,
+    _parse_iso,
+    _parse_ts_millis,
+    _semantic_history_files,
+    _stable_id,
+    load_google_takeout,
+)
 
 
 def _write_json(path: Path, payload: object) -> None:
@@ -65,3 +74,62 @@ def test_event_ids_stable_across_different_input_roots(tmp_path: Path) -> None:
 
     assert {event.event_id for event in raw_takeout} == {event.event_id for event in raw_parent}
     assert {visit.visit_id for visit in visits_takeout} == {visit.visit_id for visit in visits_parent}
+
+
+def test_streamed_and_buffered_parsing_agree(tmp_path: Path, monkeypatch) -> None:
+    _write_json(
+        tmp_path / "Takeout" / "Location History (Timeline)" / "Records.json",
+        {"locations": [{"timestampMs": "1700000000000", "latitudeE7": 377700000, "accuracy": 12.5}]},
+    )
+
+    streamed = load_google_takeout(str(tmp_path))
+    monkeypatch.setattr("location_pipeline.sources._json.ijson", None)
+    buffered = load_google_takeout(str(tmp_path))
+
+    assert streamed == buffered
+    assert streamed[0][0].payload == {"timestampMs": "1700000000000", "latitudeE7": 377700000, "accuracy": 12.5}
+
+
+def test_stable_id_is_pinned() -> None:
+    assert _stable_id("google-record", {"a": 1, "b": "é"}) == "google-record-6071e7aa781e8adc"
+
+
+def test_threaded_semantic_parse_matches_serial(tmp_path: Path) -> None:
+    for month, name in enumerate(["Cafe", "Library", "Park"], start=1):
+        _write_json(
+            tmp_path / "Takeout" / "Location History (Timeline)" / "Semantic Location History" / "2024" / f"{month}.json",
+            {
+                "timelineObjects": [
+                    {
+                        "placeVisit": {
+                            "location": {"name": name, "latitudeE7": 377710000 + month, "longitudeE7": -1224300000},
+                            "duration": {"startTimestamp": f"2024-0{month}-10T10:00:00Z"},
+                        }
+                    }
+                ]
+            },
+        )
+
+    _, visits = load_google_takeout(str(tmp_path))
+    serial = [visit for path in _semantic_history_files(tmp_path) for visit in _load_semantic_visits(path)]
+
+    assert len(serial) == 3
+    assert visits == serial
+
+
+def test_parse_iso_normalizes_to_naive_utc() -> None:
+    assert _parse_iso("2024-01-10T10:00:00.250Z") == datetime(2024, 1, 10, 10, 0, 0, 250000)
+    assert _parse_iso("2024-01-10T12:00:00+02:00") == datetime(2024, 1, 10, 10, 0)
+    assert _parse_iso("2024-01-10T10:00:00") == datetime(2024, 1, 10, 10, 0)
+    assert _parse_iso("") is None
+
+
+def test_semantic_files_found_from_any_root(tmp_path: Path) -> None:
+    history = tmp_path / "Takeout" / "Location History (Timeline)" / "Semantic Location History"
+    visit = {"placeVisit": {"location": {"name": "Cafe"}, "duration": {"startTimestamp": "2024-01-10T10:00:00Z"}}}
+    _write_json(history / "2024" / "2024_JANUARY.json", {"timelineObjects": [visit]})
+    _write_json(tmp_path / "Takeout" / "Location History (Timeline)" / "Settings.json", {"timelineObjects": [visit]})
+
+    assert len(load_google_takeout(str(tmp_path))[1]) == 1
+    assert len(load_google_takeout(str(history))[1]) == 1
+    assert len(load_google_takeout(str(history / "2024"))[1]) == 1
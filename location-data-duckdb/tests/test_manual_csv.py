@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from location_pipeline.sources.manual_csv import load_manual_csv
+
+
+def test_loads_rows_and_skips_blank_lines(tmp_path: Path) -> None:
+    csv_path = tmp_path / "manual.csv"
+    csv_path.write_text(
+        "visit_id,started_at,lat,lon,place_name\n"
+        "m-1,2024-01-01T08:00:00,37.78,-122.41,Cafe\n"
+        "\n"
+        ",,,,\n",
+        encoding="utf-8",
+    )
+
+    visits = load_manual_csv(str(csv_path))
+
+    assert [(v.visit_id, v.lat, v.lon, v.place_name) for v in visits] == [
+        ("m-1", 37.78, -122.41, "Cafe"),
+        ("manual-1", None, None, ""),
+    ]
+    assert visits[0].payload["place_name"] == "Cafe"
@@ -1,7 +1,8 @@
 from datetime import UTC, datetime
 
+import pytest
 from location_pipeline.database import init_db
-from location_pipeline.runner import run_with_audit
+from location_pipeline.runner import _insert_visits, refresh_place_dim, run_with_audit
 from location_pipeline.sources.base import VisitRecord
 
 
@@ -53,9 +54,55 @@ def test_multiple_sources_share_single_db(duckdb_conn, monkeypatch) -> None:
 
     run_with_audit(duckdb_conn, "manual_csv", {"path": "ignored"})
     run_with_audit(duckdb_conn, "foursquare_export", {"path": "ignored"})
+    assert duckdb_conn.execute("select count(*) from place_dim").fetchone()[0] == 0
+    refresh_place_dim(duckdb_conn)
 
     visit_count = duckdb_conn.execute("select count(*) from visits").fetchone()[0]
     place_count = duckdb_conn.execute("select count(*) from place_dim").fetchone()[0]
 
     assert visit_count == 2
     assert place_count == 2
+
+
+def test_insert_visits_round_trips_columns(duckdb_conn) -> None:
+    init_db(duckdb_conn)
+    visit = VisitRecord(
+        visit_id="v1",
+        source_name="manual_csv",
+        started_at=datetime(2024, 1, 1, 8, 30, tzinfo=UTC),
+        ended_at=None,
+        lat=37.78,
+        lon=None,
+        place_name="Café",
+        place_id=None,
+        list_name=None,
+        confidence=0.5,
+        payload={"name": "Café", "tags": [1, "x"]},
+    )
+
+    _insert_visits(duckdb_conn, [visit])
+
+    row = duckdb_conn.execute(
+        "select visit_id, started_at, ended_at, lat, lon, place_name, confidence, payload->>'$.tags[1]' from visits"
+    ).fetchone()
+    assert row == ("v1", datetime(2024, 1, 1, 8, 30), None, 37.78, None, "Café", 0.5, "x")
+
+
+def test_failed_run_rolls_back_partial_inserts(duckdb_conn, monkeypatch) -> None:
+    init_db(duckdb_conn)
+
+    def partial_raw_insert(conn, _records) -> None:
+        conn.execute("insert into raw_events (event_id, source_name) values ('partial', 'google_takeout')")
+
+    def failing_visit_insert(_conn, _records) -> None:
+        raise ValueError("bad export")
+
+    monkeypatch.setattr("location_pipeline.runner.load_google_takeout", lambda _path: ([], []))
+    monkeypatch.setattr("location_pipeline.runner._insert_raw_events", partial_raw_insert)
+    monkeypatch.setattr("location_pipeline.runner._insert_visits", failing_visit_insert)
+
+    with pytest.raises(ValueError, match="bad export"):
+        run_with_audit(duckdb_conn, "google_takeout", {"path": "ignored"})
+
+    assert duckdb_conn.execute("select count(*) from raw_events").fetchone()[0] == 0
+    assert duckdb_conn.execute("select status, message from ingestion_runs").fetchall() == [("failed", "bad export")]
@@ -1,12 +1,14 @@
 import argparse
 import os
-import re
+import shutil
 import sys
 import webbrowser
 import zipfile
 from datetime import UTC, datetime
 from pathlib import Path
 
+import apple_music_processor as processor
+
 DEFAULT_RAW_BASE = Path(
     os.environ.get(
         "DATALAKE_RAW_ROOT",
@@ -15,19 +17,12 @@ DEFAULT_RAW_BASE = Path(
 )
 DEFAULT_RAW_ROOT = DEFAULT_RAW_BASE / "apple-music"
 DEFAULT_DOWNLOADS = Path.home() / "Downloads"
+COPY_CHUNK_BYTES = 1024 * 1024
 PRIVACY_EXPORT_URL = "https://privacy.apple.com/account"
 
 
 def _find_latest_zip(downloads_dir: Path) -> Path | None:
-    zips = sorted(downloads_dir.glob("*.zip"), key=lambda path: path.stat().st_mtime, reverse=True)
-    return zips[0] if zips else None
-
-
-def _is_play_activity_csv_name(name: str) -> bool:
-    if not name.lower().endswith(".csv"):
-        return False
-    normalized = re.sub(r"[^a-z0-9]+", " ", Path(name).stem.lower())
-    return bool(re.search(r"\bplay\b.*\bactivity\b", normalized))
+    return max(downloads_dir.glob("*.zip"), key=lambda path: path.stat().st_mtime, default=None)
 
 
 def _extract_play_activity(zip_path: Path, output_root: Path) -> Path:
@@ -38,11 +33,11 @@ def _extract_play_activity(zip_path: Path, output_root: Path) -> Path:
     extracted = None
     with zipfile.ZipFile(zip_path, "r") as zf:
         for name in zf.namelist():
-            if _is_play_activity_csv_name(name):
+            if processor.is_play_activity_csv_name(name):
                 filename = Path(name).name
                 out_path = target_dir / filename
                 with zf.open(name) as src, out_path.open("wb") as dst:
-                    dst.write(src.read())
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
                 extracted = out_path
                 break
 
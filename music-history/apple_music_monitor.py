@@ -1,11 +1,25 @@
 import argparse
 import csv
+import io
 import json
+import mmap
 import os
 import re
+import time
 from datetime import UTC, datetime
 from pathlib import Path
 
+import apple_music_processor as processor
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+except ImportError:  # pragma: no cover - optional speedup
+    pa = None
+    pc = None
+    pacsv = None
+
 DEFAULT_RAW_BASE = Path.home() / "Library/Mobile Documents/com~apple~CloudDocs/Data Exports"
 EXIT_CODE_MISSING_CSV = 3
 PLAYED_AT_COLUMNS = [
@@ -14,87 +28,157 @@ PLAYED_AT_COLUMNS = [
     "Last Played Date",
     "Event Start Date",
 ]
-
+# Apple writes Play Activity roughly in time order, so the newest plays sit in the
+# last few KB of the file.
+TAIL_SCAN_BYTES = 64 * 1024
+# The non-ISO shapes strptime used to try one by one: "%Y-%m-%d %H:%M:%S %Z",
+# "%m/%d/%Y %I:%M:%S %p" and "%m/%d/%Y %H:%M:%S". %Z only ever accepted UTC,
+# GMT and the local zone names, and the result was treated as UTC.
+_TZ_NAMES = "|".join(re.escape(name) for name in sorted({"UTC", "GMT", *time.tzname}) if name)
+DATETIME_RE = re.compile(
+    r"(?P<y>\d{4})-(?P<mo>\d{1,2})-(?P<d>\d{1,2})[T ](?P<h>\d{1,2}):(?P<mi>\d{1,2}):(?P<s>\d{1,2})"
+    rf"(?:Z|\s+(?:{_TZ_NAMES}))?"
+    r"|(?P<us_mo>\d{1,2})/(?P<us_d>\d{1,2})/(?P<us_y>\d{4})\s+"
+    r"(?P<us_h>\d{1,2}):(?P<us_mi>\d{1,2}):(?P<us_s>\d{1,2})(?:\s*(?P<ampm>[AP]M))?",
+    re.IGNORECASE,
+)
 
 def _default_raw_root() -> Path:
     raw_base = Path(os.environ.get("DATALAKE_RAW_ROOT", str(DEFAULT_RAW_BASE)))
     return raw_base / "apple-music"
 
 
-def _is_play_activity_csv_name(name: str) -> bool:
-    if not name.lower().endswith(".csv"):
-        return False
-    normalized = re.sub(r"[^a-z0-9]+", " ", Path(name).stem.lower())
-    return bool(re.search(r"\bplay\b.*\bactivity\b", normalized))
-
-
-def discover_csv(raw_root: Path, explicit_file: Path | None) -> Path:
-    if explicit_file:
-        if not explicit_file.exists():
-            raise FileNotFoundError(f"CSV file not found: {explicit_file}")
-        return explicit_file
-
-    candidates = sorted(
-        (path for path in raw_root.rglob("*.csv") if _is_play_activity_csv_name(path.name)),
-        key=lambda path: path.stat().st_mtime,
-        reverse=True,
-    )
-    if not candidates:
-        raise FileNotFoundError(
-            f"No Apple Music Play Activity CSV found under {raw_root}. "
-            "Expected a file name containing play and activity (space/underscore/hyphen variants supported)."
-        )
-    return candidates[0]
-
-
 def _parse_dt(value: str) -> datetime | None:
     value = value.strip()
     if not value:
         return None
 
-    formats = [
-        "%Y-%m-%dT%H:%M:%SZ",
-        "%Y-%m-%d %H:%M:%S %Z",
-        "%Y-%m-%d %H:%M:%S",
-        "%m/%d/%Y %I:%M:%S %p",
-        "%m/%d/%Y %H:%M:%S",
-    ]
+    # Apple's "Event Start Timestamp" is ISO-8601; fromisoformat is far cheaper than strptime.
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    else:
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=UTC)
+        return parsed.astimezone(UTC)
 
-    for fmt in formats:
-        try:
-            parsed = datetime.strptime(value, fmt)
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=UTC)
-            return parsed.astimezone(UTC)
-        except ValueError:
-            continue
+    match = DATETIME_RE.fullmatch(value)
+    if not match:
+        return None
+    try:
+        if match["y"]:
+            return datetime(
+                int(match["y"]), int(match["mo"]), int(match["d"]),
+                int(match["h"]), int(match["mi"]), int(match["s"]),
+                tzinfo=UTC,
+            )
+        hour = int(match["us_h"])
+        if match["ampm"]:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if match["ampm"].upper() == "PM" else 0)
+        return datetime(
+            int(match["us_y"]), int(match["us_mo"]), int(match["us_d"]),
+            hour, int(match["us_mi"]), int(match["us_s"]),
+            tzinfo=UTC,
+        )
+    except ValueError:
+        return None
 
+
+def _played_column_index(header: list[str]) -> int | None:
+    for candidate in PLAYED_AT_COLUMNS:
+        if candidate in header:
+            return header.index(candidate)
     return None
 
 
-def extract_latest_played_at(csv_path: Path) -> datetime | None:
-    with csv_path.open("r", newline="", encoding="utf-8-sig") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames:
-            return None
-
-        played_col = None
-        for candidate in PLAYED_AT_COLUMNS:
-            if candidate in reader.fieldnames:
-                played_col = candidate
-                break
-
-        if not played_col:
-            return None
-
-        latest = None
-        for row in reader:
-            value = row.get(played_col, "")
-            parsed = _parse_dt(value)
+def _latest_in_tail(csv_path: Path) -> tuple[str | None, datetime | None]:
+    """Return ``(played_column, latest)`` from the last ``TAIL_SCAN_BYTES`` of the file."""
+    with csv_path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None, None
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b"\n")
+            header_line = mm[:header_end] if header_end != -1 else mm[:]
+            header = next(csv.reader([header_line.decode("utf-8-sig").rstrip("\r")]), [])
+            played_idx = _played_column_index(header)
+            if played_idx is None:
+                return None, None
+            played_col = header[played_idx]
+            if header_end == -1:
+                return played_col, None
+
+            # Step back to the start of the first complete line inside the window. Only b"\n" ends a
+            # line here: str.splitlines() also breaks on \u2028, \x1c-\x1e and \x85 inside values.
+            start = max(header_end + 1, len(mm) - TAIL_SCAN_BYTES)
+            line_start = mm.rfind(b"\n", header_end, start) + 1
+            tail = mm[line_start:].decode("utf-8", errors="replace")
+
+    rows = csv.reader(io.StringIO(tail, newline=""), strict=True)
+    latest = None
+    try:
+        if line_start > header_end + 1:
+            # The window may open inside a quoted multiline value, so its first record can be a fragment.
+            next(rows, None)
+        for row in rows:
+            # A wrong field count means the row is still part of a value split by the window edge.
+            if len(row) != len(header):
+                continue
+            parsed = _parse_dt(row[played_idx])
             if parsed and (latest is None or parsed > latest):
                 latest = parsed
+    except csv.Error:
+        # Quoting could not be resynchronised inside the window; let the caller scan every row.
+        return played_col, None
+    return played_col, latest
+
+
+def _arrow_latest_played_at(csv_path: Path, played_col: str) -> datetime | None:
+    try:
+        return _arrow_max_timestamp(csv_path, played_col, pa.timestamp("us", tz="UTC"))
+    except pa.ArrowInvalid:
+        # Offset-less ISO values are UTC wall times, as in _parse_dt. Mixed or non-ISO columns still raise.
+        latest = _arrow_max_timestamp(csv_path, played_col, pa.timestamp("us"))
+        return latest.replace(tzinfo=UTC) if latest is not None else None
+
+
+def _arrow_max_timestamp(csv_path: Path, played_col: str, column_type: "pa.DataType") -> datetime | None:
+    convert_options = pacsv.ConvertOptions(
+        include_columns=[played_col],
+        column_types={played_col: column_type},
+        timestamp_parsers=[pacsv.ISO8601],
+    )
+    # Stream record batches so memory stays flat however large the export is.
+    latest = None
+    with pacsv.open_csv(csv_path, convert_options=convert_options) as reader:
+        for batch in reader:
+            batch_max = pc.max(batch.column(0)).as_py()
+            if batch_max is not None and (latest is None or batch_max > latest):
+                latest = batch_max
+    return latest
+
+
+def _scan_latest_played_at(csv_path: Path, played_col: str) -> datetime | None:
+    if pacsv is not None:
+        try:
+            return _arrow_latest_played_at(csv_path, played_col)
+        except pa.ArrowInvalid:
+            # Non-ISO (locale formatted) or junk values; DuckDB tries every known format.
+            pass
+
+    return processor.latest_played_at(csv_path, played_col)
 
+
+def extract_latest_played_at(csv_path: Path) -> datetime | None:
+    played_col, latest = _latest_in_tail(csv_path)
+    if played_col is None:
+        return None
+    if latest is not None:
         return latest
+    # Nothing parseable near the end of the file; fall back to reading every row.
+    return _scan_latest_played_at(csv_path, played_col)
 
 
 def compute_status(days_stale: int, warn_days: int, critical_days: int) -> tuple[str, int]:
@@ -121,7 +205,7 @@ def main() -> None:
     args = parse_args()
 
     try:
-        csv_path = discover_csv(
+        csv_path = processor.discover_csv(
             raw_root=Path(args.raw_root).expanduser(),
             explicit_file=Path(args.csv_file).expanduser() if args.csv_file else None,
         )
@@ -4,7 +4,9 @@ import os
 import time
 from pathlib import Path
 
+import curated_parquet
 import duckdb
+import pyarrow as pa
 
 DEFAULT_RAW_BASE = Path(
     os.environ.get(
@@ -23,6 +25,17 @@ DEFAULT_CURATED_ROOT = DEFAULT_CURATED_BASE / "apple-music" / "recent-played"
 BASE_URL = "https://api.music.apple.com/v1/me/recent/played/tracks"
 MAX_PAGES = 5
 PAGE_LIMIT = 10
+CURATED_COLUMNS = [
+    "track_id",
+    "track",
+    "artist",
+    "album",
+    "play_params_id",
+    "track_url",
+    "ingested_at",
+    "fetched_at_utc",
+    "source",
+]
 
 
 def fetch_recent_tracks(developer_token: str, user_token: str) -> dict:
@@ -40,18 +53,21 @@ def fetch_recent_tracks(developer_token: str, user_token: str) -> dict:
     next_url = f"{BASE_URL}?limit={PAGE_LIMIT}"
     page = 0
 
-    while next_url and page < MAX_PAGES:
-        response = requests.get(next_url, headers=headers, timeout=30)
-        response.raise_for_status()
-        payload = response.json()
+    # One session keeps the TLS connection alive across the page walk.
+    with requests.Session() as session:
+        session.headers.update(headers)
+        while next_url and page < MAX_PAGES:
+            response = session.get(next_url, timeout=30)
+            response.raise_for_status()
+            payload = response.json()
 
-        rows = payload.get("data", [])
-        all_rows.extend(rows)
+            rows = payload.get("data", [])
+            all_rows.extend(rows)
 
-        next_url = payload.get("next")
-        if next_url and next_url.startswith("/"):
-            next_url = f"https://api.music.apple.com{next_url}"
-        page += 1
+            next_url = payload.get("next")
+            if next_url and next_url.startswith("/"):
+                next_url = f"https://api.music.apple.com{next_url}"
+            page += 1
 
     return {
         "fetched_at_utc": int(time.time()),
@@ -68,106 +84,76 @@ def write_raw_snapshot(raw_root: Path, payload: dict) -> Path:
     return out_path
 
 
-def upsert_curated(payload: dict, curated_root: Path) -> int:
-    curated_root.mkdir(parents=True, exist_ok=True)
+def _as_text(value: object) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _track_table(rows: list[dict]) -> pa.Table:
+    """Flatten MusicKit track resources into the string columns the curated query selects."""
+    columns: dict[str, list[str | None]] = {
+        "track_id": [],
+        "track": [],
+        "artist": [],
+        "album": [],
+        "play_params_id": [],
+        "track_url": [],
+    }
+    for row in rows:
+        attributes = row.get("attributes") or {}
+        columns["track_id"].append(_as_text(row.get("id")))
+        columns["track"].append(_as_text(attributes.get("name")))
+        columns["artist"].append(_as_text(attributes.get("artistName")))
+        columns["album"].append(_as_text(attributes.get("albumName")))
+        columns["play_params_id"].append(_as_text((attributes.get("playParams") or {}).get("id")))
+        columns["track_url"].append(_as_text(attributes.get("url")))
+    return pa.table({name: pa.array(values, type=pa.string()) for name, values in columns.items()})
 
+
+def upsert_curated(payload: dict, curated_root: Path) -> int:
     con = duckdb.connect()
     try:
-        ingested_at = payload["fetched_at_utc"]
-        raw_json = json.dumps(payload["data"]).replace("'", "''")
+        ingested_at = int(payload["fetched_at_utc"])
+        # One fetch time per snapshot, so its partition is a constant for every row. It is
+        # derived in DuckDB's session time zone, as existing partitions were, so a replayed
+        # snapshot near a month boundary lands beside the rows it deduplicates against.
+        year, month = con.execute(
+            "SELECT strftime(to_timestamp(CAST(? AS BIGINT)), '%Y'), strftime(to_timestamp(CAST(? AS BIGINT)), '%m')",
+            [ingested_at, ingested_at],
+        ).fetchone()
+        con.register("musickit_tracks", _track_table(payload["data"]))
 
         incoming_query = f"""
-WITH src AS (
-    SELECT *
-    FROM json_each('{raw_json}')
-), parsed AS (
+WITH parsed AS (
     SELECT
-        json_extract_string(value, '$.id') AS track_id,
-        json_extract_string(value, '$.attributes.name') AS track,
-        json_extract_string(value, '$.attributes.artistName') AS artist,
-        json_extract_string(value, '$.attributes.albumName') AS album,
-        json_extract_string(value, '$.attributes.playParams.id') AS play_params_id,
-        json_extract_string(value, '$.attributes.url') AS track_url,
+        track_id,
+        track,
+        artist,
+        album,
+        play_params_id,
+        track_url,
         CAST({ingested_at} AS BIGINT) AS ingested_at,
         to_timestamp(CAST({ingested_at} AS BIGINT)) AS fetched_at_utc,
         'musickit_recent_played' AS source,
-        strftime(to_timestamp(CAST({ingested_at} AS BIGINT)), '%Y') AS year,
-        strftime(to_timestamp(CAST({ingested_at} AS BIGINT)), '%m') AS month
-    FROM src
+        '{year}' AS year,
+        '{month}' AS month
+    FROM musickit_tracks
 )
 SELECT *
 FROM parsed
 WHERE track_id IS NOT NULL
 """.strip()
 
-        has_existing = bool(list(curated_root.glob("year=*/month=*/*.parquet")))
-        existing_glob = str(curated_root / "year=*" / "month=*" / "*.parquet").replace("'", "''")
-
-        if has_existing:
-            merged_query = f"""
-WITH incoming AS ({incoming_query}),
-existing AS (
-    SELECT
-        track_id,
-        track,
-        artist,
-        album,
-        play_params_id,
-        track_url,
-        ingested_at,
-        fetched_at_utc,
-        source,
-        strftime(fetched_at_utc, '%Y') AS year,
-        strftime(fetched_at_utc, '%m') AS month
-    FROM read_parquet('{existing_glob}', hive_partitioning=TRUE)
-), all_rows AS (
-    SELECT * FROM existing
-    UNION ALL
-    SELECT * FROM incoming
-), deduped AS (
-    SELECT * EXCLUDE(rn)
-    FROM (
-        SELECT *,
-            ROW_NUMBER() OVER (
-                PARTITION BY track_id, fetched_at_utc
-                ORDER BY ingested_at DESC
-            ) AS rn
-        FROM all_rows
-    )
-    WHERE rn = 1
-)
-SELECT * FROM deduped
-""".strip()
-        else:
-            merged_query = incoming_query
-
-        tmp_root = curated_root.parent / f".tmp_recent_played_{int(time.time())}"
-        if tmp_root.exists():
-            import shutil
-
-            shutil.rmtree(tmp_root)
-        tmp_root.mkdir(parents=True, exist_ok=True)
-
-        con.sql(
-            f"""
-COPY ({merged_query})
-TO '{str(tmp_root).replace("'", "''")}'
-(FORMAT PARQUET, PARTITION_BY (year, month))
-"""
+        return curated_parquet.upsert_partitions(
+            con,
+            incoming_query=incoming_query,
+            curated_root=curated_root,
+            columns=CURATED_COLUMNS,
+            dedupe_keys=["track_id", "fetched_at_utc"],
+            sort_column="fetched_at_utc",
+            staging_prefix="recent_played",
         )
-
-        parquet_glob = str(tmp_root / "year=*" / "month=*" / "*.parquet").replace("'", "''")
-        row_count = con.sql(
-            f"SELECT COUNT(*) FROM read_parquet('{parquet_glob}', hive_partitioning=TRUE)"
-        ).fetchone()[0]
-
-        import shutil
-
-        if curated_root.exists():
-            shutil.rmtree(curated_root)
-        tmp_root.rename(curated_root)
-
-        return row_count
     finally:
         con.close()
 
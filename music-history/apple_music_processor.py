@@ -2,10 +2,12 @@ import argparse
 import csv
 import os
 import re
-import shutil
 import time
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+import curated_parquet
 import duckdb
 
 DEFAULT_RAW_BASE = Path.home() / "Library/Mobile Documents/com~apple~CloudDocs/Data Exports"
@@ -44,11 +46,38 @@ def _default_roots() -> tuple[Path, Path]:
     return raw_base / "apple-music", curated_base / "apple-music" / "play-activity"
 
 
-def _is_play_activity_csv_name(name: str) -> bool:
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _has_play_then_activity(stem: str) -> bool:
+    words = NON_ALNUM_RE.split(stem.lower())
+    try:
+        play_at = words.index("play")
+    except ValueError:
+        return False
+    return "activity" in words[play_at + 1 :]
+
+
+def is_play_activity_csv_name(name: str) -> bool:
     if not name.lower().endswith(".csv"):
         return False
-    normalized = re.sub(r"[^a-z0-9]+", " ", Path(name).stem.lower())
-    return bool(re.search(r"\bplay\b.*\bactivity\b", normalized))
+    return _has_play_then_activity(os.path.basename(name)[: -len(".csv")])
+
+
+def _walk_play_activity_csvs(root: Path) -> Iterator[tuple[float, str]]:
+    """Yield ``(mtime, path)`` for Play Activity CSVs below ``root`` using one scandir pass."""
+    pending = [str(root)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif is_play_activity_csv_name(entry.name):
+                    yield entry.stat().st_mtime, entry.path
 
 
 def discover_csv(raw_root: Path, explicit_file: Path | None) -> Path:
@@ -57,17 +86,13 @@ def discover_csv(raw_root: Path, explicit_file: Path | None) -> Path:
             raise FileNotFoundError(f"CSV file not found: {explicit_file}")
         return explicit_file
 
-    candidates = sorted(
-        (path for path in raw_root.rglob("*.csv") if _is_play_activity_csv_name(path.name)),
-        key=lambda path: path.stat().st_mtime,
-        reverse=True,
-    )
-    if not candidates:
+    latest = max(_walk_play_activity_csvs(raw_root), default=None)
+    if latest is None:
         raise FileNotFoundError(
             f"No Apple Music Play Activity CSV found under {raw_root}. "
             "Expected a file name containing play and activity (space/underscore/hyphen variants supported)."
         )
-    return candidates[0]
+    return Path(latest[1])
 
 
 def _quote_ident(name: str) -> str:
@@ -159,95 +184,61 @@ WHERE played_at_utc IS NOT NULL
 """.strip()
 
 
-def _existing_parquet_glob(curated_root: Path) -> str:
-    return str(curated_root / "year=*" / "month=*" / "*.parquet").replace("'", "''")
-
-
-def process_csv(csv_path: Path, curated_root: Path) -> dict:
-    curated_root.mkdir(parents=True, exist_ok=True)
+def latest_played_at(csv_path: Path, played_col: str | None = None) -> datetime | None:
+    """Return the newest play time in ``csv_path`` as an aware UTC datetime, or ``None``.
 
+    Applies the same timestamp normalisation as ``process_csv``. ``played_col``
+    defaults to the first of ``PLAYED_AT_COLUMNS`` present in the header.
+    """
+    if played_col is None:
+        played_col = _first_present(_read_headers(csv_path), PLAYED_AT_COLUMNS)
+        if played_col is None:
+            return None
+    played_expr = _build_timestamp_expr(_quote_ident(played_col))
+    escaped_path = str(csv_path).replace("'", "''")
     con = duckdb.connect()
     try:
-        normalized_query = _build_normalized_query(csv_path)
-        incoming_deduped_query = f"""
-WITH incoming AS ({normalized_query}),
-deduped AS (
-    SELECT * EXCLUDE (rn)
-    FROM (
-        SELECT *,
-            ROW_NUMBER() OVER (
-                PARTITION BY track, artist, album, played_at_utc
-                ORDER BY ingested_at DESC
-            ) AS rn
-        FROM incoming
-    )
-    WHERE rn = 1
-)
-SELECT * FROM deduped
-""".strip()
-
-        existing_glob = _existing_parquet_glob(curated_root)
-        has_existing = bool(list((curated_root).glob("year=*/month=*/*.parquet")))
-
-        if has_existing:
-            merged_query = f"""
-WITH incoming AS ({incoming_deduped_query}),
-existing AS (
-    SELECT
-        track,
-        artist,
-        album,
-        play_count,
-        played_at_utc,
-        source,
-        source_file,
-        ingested_at,
-        strftime(played_at_utc, '%Y') AS year,
-        strftime(played_at_utc, '%m') AS month
-    FROM read_parquet('{existing_glob}', hive_partitioning=TRUE)
-), all_rows AS (
-    SELECT * FROM existing
-    UNION ALL
-    SELECT * FROM incoming
-), deduped AS (
-    SELECT * EXCLUDE (rn)
-    FROM (
-        SELECT *,
-            ROW_NUMBER() OVER (
-                PARTITION BY track, artist, album, played_at_utc
-                ORDER BY ingested_at DESC
-            ) AS rn
-        FROM all_rows
-    )
-    WHERE rn = 1
-)
-SELECT * FROM deduped
-""".strip()
-        else:
-            merged_query = incoming_deduped_query
-
-        tmp_output = curated_root.parent / f".tmp_play_activity_{int(time.time())}"
-        if tmp_output.exists():
-            shutil.rmtree(tmp_output)
-        tmp_output.mkdir(parents=True, exist_ok=True)
-
-        con.sql(
+        # Offset-less timestamps are UTC, matching the monitor's _parse_dt; a local session
+        # TimeZone would otherwise shift every value that try_strptime turns into TIMESTAMPTZ.
+        con.execute("SET TimeZone = 'UTC'")
+        latest_us = con.sql(
             f"""
-COPY ({merged_query})
-TO '{str(tmp_output).replace("'", "''")}'
-(FORMAT PARQUET, PARTITION_BY (year, month))
+SELECT epoch_us(max({played_expr}))
+FROM read_csv_auto('{escaped_path}', header=TRUE, all_varchar=TRUE, sample_size=-1, ignore_errors=TRUE)
 """
-        )
-
-        parquet_glob = str(tmp_output / "year=*" / "month=*" / "*.parquet").replace("'", "''")
-        total_rows = con.sql(
-            f"SELECT COUNT(*) FROM read_parquet('{parquet_glob}', hive_partitioning=TRUE)"
         ).fetchone()[0]
+    finally:
+        con.close()
+    if latest_us is None:
+        return None
+    # Fetched as epoch micros: the expression can be TIMESTAMPTZ, which DuckDB only hands back via pytz.
+    return datetime.fromtimestamp(0, UTC) + timedelta(microseconds=latest_us)
+
+
+CURATED_COLUMNS = [
+    "track",
+    "artist",
+    "album",
+    "play_count",
+    "played_at_utc",
+    "source",
+    "source_file",
+    "ingested_at",
+]
 
-        if curated_root.exists():
-            shutil.rmtree(curated_root)
-        tmp_output.rename(curated_root)
 
+def process_csv(csv_path: Path, curated_root: Path) -> dict:
+    con = duckdb.connect()
+    try:
+        total_rows = curated_parquet.upsert_partitions(
+            con,
+            incoming_query=_build_normalized_query(csv_path),
+            curated_root=curated_root,
+            columns=CURATED_COLUMNS,
+            dedupe_keys=["track", "artist", "album", "played_at_utc"],
+            sort_column="played_at_utc",
+            staging_prefix="play_activity",
+        )
         return {
             "input_csv": str(csv_path),
             "curated_root": str(curated_root),
@@ -4,6 +4,8 @@ import sys
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
+import duckdb
+
 DEFAULT_CSV_PATH = Path.home() / "datalake.me/raw/apple-music/Apple Music - Track Play History.csv"
 PLAY_DATE_COLUMNS = ("Play Date UTC", "Play Date")
 
@@ -18,26 +20,42 @@ def parse_iso8601_utc(value: str) -> datetime:
     return dt.astimezone(UTC)
 
 
-def analyze_export(csv_path: Path) -> tuple[int, datetime]:
-    if not csv_path.exists():
-        raise FileNotFoundError(f"Apple Music export not found: {csv_path}")
-
+def _read_header(csv_path: Path) -> list[str]:
     with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames:
-            raise ValueError("CSV appears to be empty or missing a header row.")
-
-        play_date_column = next((col for col in PLAY_DATE_COLUMNS if col in reader.fieldnames), None)
-        if not play_date_column:
-            cols = ", ".join(reader.fieldnames)
-            raise ValueError(
-                "Could not find a play-date column. Expected one of "
-                f"{PLAY_DATE_COLUMNS}. Found: {cols}"
-            )
+        return next(csv.reader(handle), [])
 
+
+def _max_via_duckdb(csv_path: Path, play_date_column: str) -> tuple[int, datetime | None, int]:
+    """Return ``(row_count, newest_play, unparseable_count)`` computed inside DuckDB."""
+    column = '"' + play_date_column.replace('"', '""') + '"'
+    escaped_path = str(csv_path).replace("'", "''")
+    con = duckdb.connect()
+    try:
+        # Offset-less timestamps are UTC, matching parse_iso8601_utc.
+        con.execute("SET TimeZone = 'UTC'")
+        row_count, newest_us, unparseable = con.sql(
+            f"""
+SELECT
+    COUNT(*),
+    epoch_us(MAX(played_at)),
+    COUNT(*) FILTER (WHERE NULLIF(TRIM(raw), '') IS NOT NULL AND played_at IS NULL)
+FROM (
+    SELECT {column} AS raw, TRY_CAST(TRIM({column}) AS TIMESTAMPTZ) AS played_at
+    FROM read_csv('{escaped_path}', header=TRUE, all_varchar=TRUE)
+)
+"""
+        ).fetchone()
+    finally:
+        con.close()
+    newest_play = None if newest_us is None else datetime.fromtimestamp(0, UTC) + timedelta(microseconds=newest_us)
+    return row_count, newest_play, unparseable
+
+
+def _max_via_python(csv_path: Path, play_date_column: str) -> tuple[int, datetime | None]:
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as handle:
         row_count = 0
         newest_play: datetime | None = None
-        for row in reader:
+        for row in csv.DictReader(handle):
             row_count += 1
             raw_date = (row.get(play_date_column) or "").strip()
             if not raw_date:
@@ -45,6 +63,32 @@ def analyze_export(csv_path: Path) -> tuple[int, datetime]:
             parsed = parse_iso8601_utc(raw_date)
             if newest_play is None or parsed > newest_play:
                 newest_play = parsed
+    return row_count, newest_play
+
+
+def analyze_export(csv_path: Path) -> tuple[int, datetime]:
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Apple Music export not found: {csv_path}")
+
+    fieldnames = _read_header(csv_path)
+    if not fieldnames:
+        raise ValueError("CSV appears to be empty or missing a header row.")
+
+    play_date_column = next((col for col in PLAY_DATE_COLUMNS if col in fieldnames), None)
+    if not play_date_column:
+        cols = ", ".join(fieldnames)
+        raise ValueError(
+            "Could not find a play-date column. Expected one of "
+            f"{PLAY_DATE_COLUMNS}. Found: {cols}"
+        )
+
+    try:
+        row_count, newest_play, unparseable = _max_via_duckdb(csv_path, play_date_column)
+    except duckdb.Error:
+        unparseable = None
+    if unparseable != 0:
+        # DuckDB failed or skipped values it could not cast; the Python path reports them precisely.
+        row_count, newest_play = _max_via_python(csv_path, play_date_column)
 
     if row_count == 0:
         raise ValueError("CSV has a header but no data rows.")
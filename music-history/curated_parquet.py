@@ -0,0 +1,132 @@
+"""Incremental upserts into hive-partitioned (year=/month=) curated parquet datasets."""
+from __future__ import annotations
+
+import shutil
+import time
+from pathlib import Path
+
+import duckdb
+
+ROW_GROUP_SIZE = 100_000
+
+
+def _sql_path(path: Path) -> str:
+    return str(path).replace("'", "''")
+
+
+def dataset_glob(curated_root: Path) -> str:
+    return _sql_path(curated_root / "year=*" / "month=*" / "*.parquet")
+
+
+def count_rows(con: duckdb.DuckDBPyConnection, curated_root: Path) -> int:
+    if not any(curated_root.glob("year=*/month=*/*.parquet")):
+        return 0
+    return con.sql(
+        f"SELECT COUNT(*) FROM read_parquet('{dataset_glob(curated_root)}', hive_partitioning=TRUE)"
+    ).fetchone()[0]
+
+
+def _has_new_keys(
+    con: duckdb.DuckDBPyConnection,
+    existing_source: str,
+    year: str,
+    month: str,
+    dedupe_keys: list[str],
+) -> bool:
+    key_match = " AND ".join(f"e.{key} IS NOT DISTINCT FROM i.{key}" for key in dedupe_keys)
+    return con.sql(
+        f"""
+SELECT EXISTS (
+    SELECT 1
+    FROM incoming AS i
+    WHERE i.year = '{year}' AND i.month = '{month}'
+      AND NOT EXISTS (SELECT 1 FROM {existing_source} AS e WHERE {key_match})
+)
+"""
+    ).fetchone()[0]
+
+
+def upsert_partitions(
+    con: duckdb.DuckDBPyConnection,
+    incoming_query: str,
+    curated_root: Path,
+    columns: list[str],
+    dedupe_keys: list[str],
+    sort_column: str,
+    staging_prefix: str,
+) -> int:
+    """Merge ``incoming_query`` into ``curated_root``, rewriting only the partitions it touches.
+
+    ``incoming_query`` must yield ``columns`` plus string ``year`` and ``month``
+    columns. Within each touched partition rows are deduplicated on
+    ``dedupe_keys``, keeping the highest ``ingested_at``, and written in
+    ``sort_column`` order so parquet min/max statistics prune time-range scans.
+    Partitions that already hold every incoming key are left untouched.
+    Returns the total row count of the dataset after the merge.
+    """
+    curated_root.mkdir(parents=True, exist_ok=True)
+    con.execute(f"CREATE OR REPLACE TEMP TABLE incoming AS {incoming_query}")
+    partitions = con.sql("SELECT DISTINCT year, month FROM incoming ORDER BY year, month").fetchall()
+
+    column_list = ", ".join(columns)
+    partition_by = ", ".join(dedupe_keys)
+    staging_root = curated_root.parent / f".tmp_{staging_prefix}_{int(time.time())}"
+    if staging_root.exists():
+        shutil.rmtree(staging_root)
+
+    try:
+        staged = []
+        for year, month in partitions:
+            partition = Path(f"year={year}") / f"month={month}"
+            existing_dir = curated_root / partition
+            existing_select = ""
+            if any(existing_dir.glob("*.parquet")):
+                existing_source = f"read_parquet('{_sql_path(existing_dir / '*.parquet')}', hive_partitioning=FALSE)"
+                if not _has_new_keys(con, existing_source, year, month, dedupe_keys):
+                    # Re-polled or re-exported rows only; the partition on disk already holds them.
+                    continue
+                existing_select = f"""
+    SELECT {column_list}
+    FROM {existing_source}
+    UNION ALL"""
+
+            staged_dir = staging_root / partition
+            staged_dir.mkdir(parents=True)
+            con.sql(
+                f"""
+COPY (
+    WITH all_rows AS ({existing_select}
+        SELECT {column_list}
+        FROM incoming
+        WHERE year = '{year}' AND month = '{month}'
+    )
+    SELECT * EXCLUDE (rn)
+    FROM (
+        SELECT *,
+            ROW_NUMBER() OVER (
+                PARTITION BY {partition_by}
+                ORDER BY ingested_at DESC
+            ) AS rn
+        FROM all_rows
+    )
+    WHERE rn = 1
+    ORDER BY {sort_column}
+)
+TO '{_sql_path(staged_dir / "data_0.parquet")}'
+(FORMAT PARQUET, COMPRESSION zstd, COMPRESSION_LEVEL 3, ROW_GROUP_SIZE {ROW_GROUP_SIZE})
+"""
+            )
+            staged.append((staged_dir, existing_dir))
+
+        # Every partition is written before any is swapped, so a failed COPY leaves the dataset untouched.
+        for staged_dir, existing_dir in staged:
+            if existing_dir.exists():
+                shutil.rmtree(existing_dir)
+            existing_dir.parent.mkdir(parents=True, exist_ok=True)
+            staged_dir.rename(existing_dir)
+    finally:
+        con.execute("DROP TABLE IF EXISTS incoming")
+        if staging_root.exists():
+            shutil.rmtree(staging_root)
+
+    return count_rows(con, curated_root)
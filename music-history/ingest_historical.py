@@ -7,6 +7,17 @@ from config import CURATED_ROOT as _CURATED_BASE
 
 CSV_PATH = DATALAKE_ROOT / "scrobbles-clakesnapster-1699153095.csv"
 CURATED_ROOT = _CURATED_BASE / "lastfm/scrobbles"
+# Fixed layout of the Last.fm scrobble CSV export; naming every column skips DuckDB's sniffing pass.
+CSV_COLUMNS = {
+    "uts": "BIGINT",
+    "utc_time": "VARCHAR",
+    "artist": "VARCHAR",
+    "artist_mbid": "VARCHAR",
+    "album": "VARCHAR",
+    "album_mbid": "VARCHAR",
+    "track": "VARCHAR",
+    "track_mbid": "VARCHAR",
+}
 
 def ingest():
     print(f"Ingesting {CSV_PATH}...")
@@ -20,23 +31,20 @@ def ingest():
 
     query = f"""
     SELECT
-        CAST(uts AS BIGINT) as uts,
-        make_timestamp(
-            CAST(strftime(to_timestamp(CAST(uts AS BIGINT)), '%Y') AS BIGINT),
-            CAST(strftime(to_timestamp(CAST(uts AS BIGINT)), '%m') AS BIGINT),
-            CAST(strftime(to_timestamp(CAST(uts AS BIGINT)), '%d') AS BIGINT),
-            CAST(strftime(to_timestamp(CAST(uts AS BIGINT)), '%H') AS BIGINT),
-            CAST(strftime(to_timestamp(CAST(uts AS BIGINT)), '%M') AS BIGINT),
-            CAST(strftime(to_timestamp(CAST(uts AS BIGINT)), '%S') AS DOUBLE)
-        ) as played_at_utc,
+        uts,
+        CAST(ts AS TIMESTAMP) as played_at_utc,
         artist,
         track,
         album,
         track_mbid as mbid_track,
         'lastfm_csv_export' as source,
-        strftime(to_timestamp(CAST(uts AS BIGINT)), '%Y') as year,
-        strftime(to_timestamp(CAST(uts AS BIGINT)), '%m') as month
-    FROM read_csv('{CSV_PATH}', auto_detect=TRUE)
+        strftime(ts, '%Y') as year,
+        strftime(ts, '%m') as month
+    FROM (
+        -- Convert each epoch once; every derived column reads ts.
+        SELECT *, to_timestamp(uts) as ts
+        FROM read_csv('{CSV_PATH}', header=TRUE, delim=',', quote='"', columns={CSV_COLUMNS!r})
+    ) s
     """
 
     # 2. Write to Parquet (Partitioned)
@@ -1,11 +1,14 @@
 import json
 import os
+import re
 import time
 from collections import defaultdict
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import requests
 
@@ -31,6 +34,9 @@ STATE_DIR = Path.home() / ".local" / "share" / "datalake"
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 STATE_FILE = STATE_DIR / "lastfm_last_uts.txt"
 
+MONTHLY_FILE_RE = re.compile(r"scrobbles_\d{4}-\d{2}\.jsonl")
+TAIL_READ_BYTES = 64 * 1024
+
 
 def get_credentials() -> tuple[str, str]:
     user = os.environ.get("LASTFM_USER")
@@ -104,18 +110,63 @@ def iter_jsonl(path: Path):
                 continue
 
 
-def load_last_uts_from_raw(raw_dir: Path = RAW) -> int | None:
+def _max_uts(path: Path) -> int | None:
+    latest = None
+    for row in iter_jsonl(path):
+        uts = extract_uts(row)
+        if uts is not None and (latest is None or uts > latest):
+            latest = uts
+    return latest
+
+
+def _last_uts_in_tail(path: Path) -> int | None:
+    """Return the uts of the last parseable row within the final ``TAIL_READ_BYTES`` of ``path``."""
+    with path.open("rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - TAIL_READ_BYTES))
+        lines = f.read().splitlines()
+    if size > TAIL_READ_BYTES:
+        lines = lines[1:]  # Almost certainly a partial line.
+
+    for line in reversed(lines):
+        if not line.strip():
+            continue
+        try:
+            uts = extract_uts(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+        if uts is not None:
+            return uts
+    return None
+
+
+def load_last_uts_from_raw(raw_dir: Path = RAW, exact: bool = False) -> int | None:
+    """Newest scrobble uts across the raw JSONL files.
+
+    merge_raw_monthly_jsonl keeps each ``scrobbles_YYYY-MM.jsonl`` sorted by uts, so
+    only the tail of the newest month is read. Other JSONL files (e.g. the page
+    dumps written by scripts/lastfm_ingest.py) are scanned in full, as is
+    everything when ``exact`` is set.
+    """
     if not raw_dir.exists():
         return None
 
+    monthly: list[Path] = []
     latest = None
     for path in raw_dir.glob("*.jsonl"):
-        for row in iter_jsonl(path):
-            uts = extract_uts(row)
-            if uts is None:
-                continue
-            if latest is None or uts > latest:
-                latest = uts
+        if not exact and MONTHLY_FILE_RE.fullmatch(path.name):
+            monthly.append(path)
+            continue
+        uts = _max_uts(path)
+        if uts is not None and (latest is None or uts > latest):
+            latest = uts
+
+    for path in sorted(monthly, key=lambda p: p.name, reverse=True):
+        uts = _last_uts_in_tail(path)
+        if uts is None:
+            uts = _max_uts(path)
+        if uts is not None:
+            return uts if latest is None or uts > latest else latest
     return latest
 
 
@@ -153,24 +204,24 @@ def fetch_page(from_uts: int | None, page: int) -> dict:
     return r.json()
 
 
-def normalize(items):
-    out = []
-    for it in items:
-        if "@attr" in it and it["@attr"].get("nowplaying") == "true":
-            continue
-        uts = int(it["date"]["uts"])
-        out.append(
-            {
-                "uts": uts,
-                "played_at_utc": pd.to_datetime(uts, unit="s", utc=True),
-                "artist": it["artist"]["#text"],
-                "track": it["name"],
-                "album": it.get("album", {}).get("#text") or None,
-                "mbid_track": it.get("mbid") or None,
-                "source": "lastfm",
-            }
-        )
-    return out
+NORMALIZED_COLUMNS = ["uts", "played_at_utc", "artist", "track", "album", "mbid_track", "source"]
+
+
+def normalize(items) -> pd.DataFrame:
+    played = [it for it in items if not ("@attr" in it and it["@attr"].get("nowplaying") == "true")]
+    uts = np.array([int(it["date"]["uts"]) for it in played], dtype=np.int64)
+    return pd.DataFrame(
+        {
+            "uts": uts,
+            "played_at_utc": pd.to_datetime(uts, unit="s", utc=True),
+            "artist": [it["artist"]["#text"] for it in played],
+            "track": [it["name"] for it in played],
+            "album": [it.get("album", {}).get("#text") or None for it in played],
+            "mbid_track": [it.get("mbid") or None for it in played],
+            "source": "lastfm",
+        },
+        columns=NORMALIZED_COLUMNS,
+    )
 
 
 def month_file_for_uts(raw_dir: Path, uts: int) -> Path:
@@ -186,6 +237,16 @@ def _serialize_row(row: dict) -> dict:
     return out
 
 
+def _append_sorted_rows(month_file: Path, rows: list[dict]) -> None:
+    deduped = {row_key(row): row for row in rows}
+    with month_file.open("rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+        for row in sorted(deduped.values(), key=lambda r: int(r["uts"])):
+            f.write((json.dumps(row, ensure_ascii=False) + "\n").encode())
+
+
 def merge_raw_monthly_jsonl(rows: list[dict], raw_dir: Path = RAW) -> None:
     if not rows:
         return
@@ -197,6 +258,14 @@ def merge_raw_monthly_jsonl(rows: list[dict], raw_dir: Path = RAW) -> None:
         by_month[month_file_for_uts(raw_dir, int(row["uts"]))].append(_serialize_row(row))
 
     for month_file, month_rows in by_month.items():
+        if month_file.exists():
+            # Month files are kept sorted by uts, so rows newer than the tail can't collide
+            # with anything already stored and are simply appended.
+            last_uts = _last_uts_in_tail(month_file)
+            if last_uts is not None and all(int(row["uts"]) > last_uts for row in month_rows):
+                _append_sorted_rows(month_file, month_rows)
+                continue
+
         merged: dict[tuple, dict] = {}
 
         if month_file.exists():
@@ -226,20 +295,25 @@ def merge_raw_monthly_jsonl(rows: list[dict], raw_dir: Path = RAW) -> None:
 def append_parquet_partitions(df: pd.DataFrame):
     if df.empty:
         return
-    df["year"] = df["played_at_utc"].dt.year.astype(int)
-    df["month"] = df["played_at_utc"].dt.month.astype(int)
-
-    for (y, m), g in df.groupby(["year", "month"]):
-        part_dir = CURATED / f"year={y:04d}" / f"month={m:02d}"
-        part_dir.mkdir(parents=True, exist_ok=True)
-        out_file = part_dir / f"scrobbles_{int(time.time())}.parquet"
-        table = pa.Table.from_pandas(g.drop(columns=["year", "month"]), preserve_index=False)
-        pq.write_table(table, out_file)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    played_at = table.column("played_at_utc")
+    table = table.append_column("year", pc.strftime(played_at, format="%Y")).append_column(
+        "month", pc.strftime(played_at, format="%m")
+    )
+    # Arrow splits the table by partition in C++; one file per touched year=/month= directory.
+    pq.write_to_dataset(
+        table,
+        root_path=str(CURATED),
+        partition_cols=["year", "month"],
+        basename_template=f"scrobbles_{int(time.time())}_{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        use_threads=True,
+    )
 
 
 def main():
     from_uts = determine_from_uts()
-    all_rows = []
+    frames = []
     page = 1
 
     while True:
@@ -247,9 +321,9 @@ def main():
         recent = payload.get("recenttracks", {})
         tracks = recent.get("track", [])
         rows = normalize(tracks)
-        if not rows:
+        if rows.empty:
             break
-        all_rows.extend(rows)
+        frames.append(rows)
 
         attr = recent.get("@attr", {})
         total_pages = int(attr.get("totalPages", "1"))
@@ -257,10 +331,10 @@ def main():
             break
         page += 1
 
-    if not all_rows:
+    if not frames:
         return
 
-    df = pd.DataFrame(all_rows).drop_duplicates(subset=["uts", "artist", "track", "album"])
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(subset=["uts", "artist", "track", "album"])
 
     merge_raw_monthly_jsonl(df.to_dict(orient="records"))
     append_parquet_partitions(df)
@@ -1,3 +1,4 @@
+import os
 import tempfile
 import unittest
 import zipfile
@@ -22,6 +23,19 @@ class AppleMusicExportHelperTests(unittest.TestCase):
             self.assertEqual(extracted.name, csv_name)
             self.assertTrue(extracted.exists())
 
+    def test_find_latest_zip_picks_newest_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            self.assertIsNone(helper._find_latest_zip(tmp_path))
+
+            older = tmp_path / "privacy-export-b.zip"
+            newer = tmp_path / "privacy-export-a.zip"
+            for path, mtime in ((older, 1_000), (newer, 2_000)):
+                path.write_bytes(b"")
+                os.utime(path, (mtime, mtime))
+
+            self.assertEqual(helper._find_latest_zip(tmp_path), newer)
+
 
 if __name__ == "__main__":
     unittest.main()
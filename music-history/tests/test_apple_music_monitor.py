@@ -22,6 +22,111 @@ class AppleMusicMonitorTests(unittest.TestCase):
             latest = monitor.extract_latest_played_at(csv_path)
             self.assertEqual(latest, datetime(2023, 3, 5, 18, 30, 0, tzinfo=UTC))
 
+    def test_extract_latest_played_at_reads_only_file_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            head = "Track Name,Event Start Timestamp\n" + "Old,2020-01-01T00:00:00Z\n" * 10_000
+            csv_path.write_text(
+                head + '"Late, Track",2024-06-02T08:00:00Z\n' + "Latest,2024-06-03T09:15:00Z\n",
+                encoding="utf-8",
+            )
+
+            with mock.patch.object(monitor, "_scan_latest_played_at") as full_scan:
+                latest = monitor.extract_latest_played_at(csv_path)
+
+            full_scan.assert_not_called()
+            self.assertEqual(latest, datetime(2024, 6, 3, 9, 15, 0, tzinfo=UTC))
+
+    def test_extract_latest_played_at_skips_multiline_fragment_at_tail_start(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            # The window opens inside a quoted multiline value whose second line looks like a row.
+            window = 'Liner,2099-01-01T00:00:00Z\nnotes",2024-06-02T08:00:00Z\nLatest\u2028Mix,2024-06-03T09:15:00Z\n'
+            csv_path.write_text(
+                "Track Name,Event Start Timestamp\n"
+                "Old,2020-01-01T00:00:00Z\n"
+                '"Lyrics line one\n' + window,
+                encoding="utf-8",
+            )
+
+            with (
+                mock.patch.object(monitor, "TAIL_SCAN_BYTES", len(window.encode("utf-8")) - 1),
+                mock.patch.object(monitor, "_scan_latest_played_at") as full_scan,
+            ):
+                latest = monitor.extract_latest_played_at(csv_path)
+
+            full_scan.assert_not_called()
+            self.assertEqual(latest, datetime(2024, 6, 3, 9, 15, 0, tzinfo=UTC))
+
+    def test_extract_latest_played_at_falls_back_when_tail_unparseable(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text(
+                "Event Start Timestamp\n2023-03-05T18:30:00Z\n" + "not-a-date\n" * 20_000,
+                encoding="utf-8",
+            )
+
+            latest = monitor.extract_latest_played_at(csv_path)
+            self.assertEqual(latest, datetime(2023, 3, 5, 18, 30, 0, tzinfo=UTC))
+
+    def test_scan_latest_played_at_matches_duckdb_fallback(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text(
+                "Track Name,Event Start Timestamp\n"
+                "A,2023-03-05T18:30:00Z\n"
+                "B,\n"
+                "C,2023-02-01T10:00:00Z\n",
+                encoding="utf-8",
+            )
+
+            vectorized = monitor._scan_latest_played_at(csv_path, "Event Start Timestamp")
+            with mock.patch.object(monitor, "pacsv", None):
+                fallback = monitor._scan_latest_played_at(csv_path, "Event Start Timestamp")
+
+            self.assertEqual(vectorized, datetime(2023, 3, 5, 18, 30, 0, tzinfo=UTC))
+            self.assertEqual(vectorized, fallback)
+
+    def test_scan_latest_played_at_reads_offsetless_iso_as_utc(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text(
+                "Event Start Timestamp\n2023-03-05 18:30:00\n2023-02-01T10:00:00\n",
+                encoding="utf-8",
+            )
+
+            with mock.patch.object(monitor.processor, "latest_played_at") as duckdb_scan:
+                latest = monitor._scan_latest_played_at(csv_path, "Event Start Timestamp")
+
+            duckdb_scan.assert_not_called()
+            self.assertEqual(latest, datetime(2023, 3, 5, 18, 30, 0, tzinfo=UTC))
+
+    def test_scan_latest_played_at_handles_locale_formats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text(
+                "Play Date UTC\n03/05/2023 06:30:00 PM\n02/01/2023 10:00:00 AM\njunk\n",
+                encoding="utf-8",
+            )
+
+            latest = monitor._scan_latest_played_at(csv_path, "Play Date UTC")
+            self.assertEqual(latest, datetime(2023, 3, 5, 18, 30, 0, tzinfo=UTC))
+
+    def test_parse_dt_handles_iso_and_locale_formats(self) -> None:
+        expected = datetime(2023, 3, 5, 18, 30, 0, tzinfo=UTC)
+        self.assertEqual(monitor._parse_dt("2023-03-05T18:30:00Z"), expected)
+        self.assertEqual(monitor._parse_dt("2023-03-05T20:30:00+02:00"), expected)
+        self.assertEqual(monitor._parse_dt("2023-03-05 18:30:00"), expected)
+        self.assertEqual(monitor._parse_dt("2023-03-05 18:30:00 UTC"), expected)
+        self.assertEqual(monitor._parse_dt("03/05/2023 06:30:00 PM"), expected)
+        self.assertIsNone(monitor._parse_dt("not-a-date"))
+
+    def test_parse_dt_rejects_out_of_range_locale_values(self) -> None:
+        self.assertEqual(monitor._parse_dt("3/5/2023 12:05:00 am"), datetime(2023, 3, 5, 0, 5, 0, tzinfo=UTC))
+        self.assertIsNone(monitor._parse_dt("13/05/2023 10:00:00"))
+        self.assertIsNone(monitor._parse_dt("03/05/2023 13:00:00 PM"))
+        self.assertIsNone(monitor._parse_dt("2023-03-05 18:30:00 XYZ"))
+
     def test_compute_status_thresholds(self) -> None:
         self.assertEqual(monitor.compute_status(days_stale=5, warn_days=30, critical_days=90), ("fresh", 0))
         self.assertEqual(monitor.compute_status(days_stale=35, warn_days=30, critical_days=90), ("warning", 1))
@@ -38,7 +143,7 @@ class AppleMusicMonitorTests(unittest.TestCase):
 
         with (
             mock.patch("apple_music_monitor.parse_args", return_value=args),
-            mock.patch("apple_music_monitor.discover_csv", side_effect=FileNotFoundError("missing csv")),
+            mock.patch("apple_music_monitor.processor.discover_csv", side_effect=FileNotFoundError("missing csv")),
         ):
             with self.assertRaises(SystemExit) as cm:
                 monitor.main()
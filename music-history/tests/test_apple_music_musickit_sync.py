@@ -1,6 +1,7 @@
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import apple_music_musickit_sync as musickit
 import duckdb
@@ -41,6 +42,7 @@ class AppleMusicMusicKitSyncTests(unittest.TestCase):
 
             self.assertEqual(first_count, 2)
             self.assertEqual(second_count, 2)
+            self.assertTrue((curated_root / "year=2023" / "month=11").is_dir())
 
             con = duckdb.connect()
             try:
@@ -53,6 +55,87 @@ class AppleMusicMusicKitSyncTests(unittest.TestCase):
 
             self.assertEqual(rows, [("track-1", "Track A"), ("track-2", "Track B")])
 
+    def test_upsert_curated_partitions_in_session_time_zone(self) -> None:
+        real_connect = duckdb.connect
+
+        def los_angeles_connect(*args, **kwargs):
+            con = real_connect(*args, **kwargs)
+            con.execute("SET TimeZone = 'America/Los_Angeles'")
+            return con
+
+        # 2023-12-01T03:00:00Z is still November in Los Angeles.
+        payload = {"fetched_at_utc": 1701399600, "data": [{"id": "track-1", "attributes": {"name": "Track A"}}]}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            curated_root = Path(tmp_dir) / "curated"
+            with mock.patch.object(musickit.duckdb, "connect", side_effect=los_angeles_connect):
+                musickit.upsert_curated(payload=payload, curated_root=curated_root)
+
+            self.assertEqual(
+                [path.relative_to(curated_root).as_posix() for path in curated_root.glob("year=*/month=*")],
+                ["year=2023/month=11"],
+            )
+
+    def test_upsert_curated_skips_rewrite_when_snapshot_already_stored(self) -> None:
+        payload = {"fetched_at_utc": 1700000000, "data": [{"id": "track-1", "attributes": {"name": "Track A"}}]}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            curated_root = Path(tmp_dir) / "curated"
+            musickit.upsert_curated(payload=payload, curated_root=curated_root)
+            stored = next(curated_root.glob("year=*/month=*/*.parquet"))
+            stored_inode = stored.stat().st_ino
+
+            count = musickit.upsert_curated(payload=payload, curated_root=curated_root)
+
+            self.assertEqual(count, 1)
+            self.assertEqual(stored.stat().st_ino, stored_inode)
+
+    def test_upsert_curated_handles_quotes_and_sparse_tracks(self) -> None:
+        payload = {
+            "fetched_at_utc": 1700000000,
+            "data": [
+                {"id": "track-1", "attributes": {"name": "Don't Stop", "artistName": "Fleetwood Mac"}},
+                {"id": 42},
+                {"attributes": {"name": "No id"}},
+            ],
+        }
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            curated_root = Path(tmp_dir) / "curated"
+            count = musickit.upsert_curated(payload=payload, curated_root=curated_root)
+
+            con = duckdb.connect()
+            try:
+                dataset_glob = str(curated_root / "year=*" / "month=*" / "*.parquet")
+                rows = con.sql(
+                    f"SELECT track_id, track, album FROM read_parquet('{dataset_glob}') ORDER BY track_id"
+                ).fetchall()
+            finally:
+                con.close()
+
+            self.assertEqual(count, 2)
+            self.assertEqual(rows, [("42", None, None), ("track-1", "Don't Stop", None)])
+
+    def test_fetch_recent_tracks_reuses_one_session_across_pages(self) -> None:
+        pages = [
+            {"data": [{"id": "track-1"}], "next": "/v1/me/recent/played/tracks?offset=10"},
+            {"data": [{"id": "track-2"}]},
+        ]
+        session = mock.MagicMock()
+        session.__enter__.return_value = session
+        session.headers = {}
+        session.get.side_effect = [mock.Mock(json=mock.Mock(return_value=page)) for page in pages]
+
+        with mock.patch("requests.Session", return_value=session):
+            payload = musickit.fetch_recent_tracks(developer_token="dev", user_token="user")
+
+        self.assertEqual([row["id"] for row in payload["data"]], ["track-1", "track-2"])
+        self.assertEqual(session.headers["Music-User-Token"], "user")
+        self.assertEqual(
+            session.get.call_args_list[1].args[0],
+            "https://api.music.apple.com/v1/me/recent/played/tracks?offset=10",
+        )
+
     def test_write_raw_snapshot_creates_json_file(self) -> None:
         payload = {"fetched_at_utc": 1700000001, "data": []}
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -1,6 +1,7 @@
 import os
 import tempfile
 import unittest
+from datetime import UTC, datetime
 from pathlib import Path
 from unittest import mock
 
@@ -43,6 +44,36 @@ ORDER BY played_at_utc
             self.assertEqual(rows[1][0], "Track B")
             self.assertEqual(len(rows), 2)
 
+    def test_process_csv_rewrites_only_touched_partitions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            header = "Track Description,Artist Name,Container Description,Event Start Timestamp,Play Count\n"
+            first_csv = tmp_path / "first_Play Activity.csv"
+            first_csv.write_text(
+                header
+                + "Track A,Artist A,Album A,2023-11-01T10:00:00Z,1\n"
+                + "Track B,Artist B,Album B,2023-12-05T18:30:00Z,1\n",
+                encoding="utf-8",
+            )
+            second_csv = tmp_path / "second_Play Activity.csv"
+            second_csv.write_text(
+                header
+                + "Track B,Artist B,Album B,2023-12-05T18:30:00Z,1\n"
+                + "Track C,Artist C,Album C,2023-12-06T08:00:00Z,1\n",
+                encoding="utf-8",
+            )
+
+            curated_root = tmp_path / "curated"
+            processor.process_csv(csv_path=first_csv, curated_root=curated_root)
+            november = next((curated_root / "year=2023" / "month=11").glob("*.parquet"))
+            november_inode = november.stat().st_ino
+
+            result = processor.process_csv(csv_path=second_csv, curated_root=curated_root)
+
+            self.assertEqual(result["total_rows"], 3)
+            self.assertEqual(november.stat().st_ino, november_inode)
+            self.assertEqual(list(curated_root.parent.glob(".tmp_*")), [])
+
     def test_discover_csv_selects_latest_play_activity_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
@@ -54,6 +85,23 @@ ORDER BY played_at_utc
             selected = processor.discover_csv(raw_root=tmp_path, explicit_file=None)
             self.assertEqual(selected, new_file)
 
+    def test_discover_csv_walks_nested_folders_by_mtime(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            nested = tmp_path / "2024" / "06"
+            nested.mkdir(parents=True)
+            newest = nested / "Apple Music Play Activity.csv"
+            older = tmp_path / "Apple_Music_Play_Activity.csv"
+            unrelated = tmp_path / "Library Tracks.csv"
+            for path in (newest, older, unrelated):
+                path.write_text("Event Start Timestamp\n", encoding="utf-8")
+            os.utime(older, (1_000, 1_000))
+            os.utime(newest, (2_000, 2_000))
+            os.utime(unrelated, (3_000, 3_000))
+
+            selected = processor.discover_csv(raw_root=tmp_path, explicit_file=None)
+            self.assertEqual(selected, newest)
+
     def test_discover_csv_supports_underscore_filename(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
@@ -63,6 +111,54 @@ ORDER BY played_at_utc
             selected = processor.discover_csv(raw_root=tmp_path, explicit_file=None)
             self.assertEqual(selected, csv_path)
 
+    def test_is_play_activity_csv_name_matches_play_then_activity_words(self) -> None:
+        self.assertTrue(processor.is_play_activity_csv_name("Apple Music Play Activity.csv"))
+        self.assertTrue(processor.is_play_activity_csv_name("apple-music/Apple_Music_Play_Activity.CSV"))
+        self.assertFalse(processor.is_play_activity_csv_name("Play Activity/Library Tracks.csv"))
+        self.assertFalse(processor.is_play_activity_csv_name("Activity Play.csv"))
+        self.assertFalse(processor.is_play_activity_csv_name("Display Activity.csv"))
+        self.assertFalse(processor.is_play_activity_csv_name("Apple Music Play Activity.json"))
+
+    def test_latest_played_at_reads_first_played_column(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text(
+                "Track Name,Play Date UTC\n"
+                "A,03/05/2023 06:30:00 PM\n"
+                "B,not-a-date\n"
+                "C,2023-02-01 10:00:00\n",
+                encoding="utf-8",
+            )
+
+            self.assertEqual(processor.latest_played_at(csv_path), datetime(2023, 3, 5, 18, 30, tzinfo=UTC))
+
+    def test_latest_played_at_ignores_local_session_time_zone(self) -> None:
+        real_connect = duckdb.connect
+
+        def los_angeles_connect(*args, **kwargs):
+            con = real_connect(*args, **kwargs)
+            con.execute("SET TimeZone = 'America/Los_Angeles'")
+            return con
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text(
+                "Play Date UTC\n2023-03-05T18:30:00Z\n01/02/2024 10:00:00 PM\n",
+                encoding="utf-8",
+            )
+
+            with mock.patch.object(processor.duckdb, "connect", side_effect=los_angeles_connect):
+                latest = processor.latest_played_at(csv_path)
+
+            self.assertEqual(latest, datetime(2024, 1, 2, 22, 0, tzinfo=UTC))
+
+    def test_latest_played_at_returns_none_without_played_column(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "Apple Music Play Activity.csv"
+            csv_path.write_text("Track Name\nA\n", encoding="utf-8")
+
+            self.assertIsNone(processor.latest_played_at(csv_path))
+
     def test_default_roots_use_environment_variables(self) -> None:
         with mock.patch.dict(
             os.environ,
@@ -129,3 +129,34 @@ def test_main_uses_full_timedelta_precision_for_staleness(
     out = capsys.readouterr()
     assert exit_code == 2
     assert "Apple Music play history export is stale." in out.err
+
+
+def test_analyze_export_duckdb_matches_python_path(tmp_path: Path) -> None:
+    csv_path = tmp_path / "Apple Music - Track Play History.csv"
+    write_csv(
+        csv_path,
+        "Track Name,Play Date UTC\n"
+        '"Song, A",2025-12-01T01:02:03Z\n'
+        "Song B,\n"
+        "Song C,2026-02-10T22:00:00+02:00\n"
+        "Song D,2026-02-10 21:00:00\n",
+    )
+
+    fast_count, fast_newest, unparseable = checker._max_via_duckdb(csv_path, "Play Date UTC")
+    slow_count, slow_newest = checker._max_via_python(csv_path, "Play Date UTC")
+
+    assert unparseable == 0
+    assert (fast_count, fast_newest) == (slow_count, slow_newest) == (4, datetime(2026, 2, 10, 21, 0, 0, tzinfo=UTC))
+
+
+def test_analyze_export_still_rejects_unparseable_dates(tmp_path: Path) -> None:
+    csv_path = tmp_path / "Apple Music - Track Play History.csv"
+    write_csv(
+        csv_path,
+        "Track Name,Play Date UTC\n"
+        "Song A,2026-02-10T22:00:00Z\n"
+        "Song B,last tuesday\n",
+    )
+
+    with pytest.raises(ValueError, match="last tuesday"):
+        analyze_export(csv_path)
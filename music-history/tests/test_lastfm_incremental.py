@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+import main
 import pandas as pd
 from main import determine_from_uts, load_last_uts_from_raw, merge_raw_monthly_jsonl
 
@@ -33,6 +34,30 @@ def test_load_last_uts_from_raw_reads_max_timestamp(tmp_path):
     assert load_last_uts_from_raw(raw_dir) == 150
 
 
+def test_load_last_uts_from_raw_reads_only_newest_month_tail(tmp_path, monkeypatch):
+    raw_dir = tmp_path / "lastfm"
+    _write_jsonl(raw_dir / "scrobbles_2023-12.jsonl", [{"uts": 90}])
+    _write_jsonl(
+        raw_dir / "scrobbles_2024-01.jsonl",
+        [{"uts": 100 + i, "artist": "A" * 40} for i in range(5_000)],
+    )
+    scanned = []
+    original_max_uts = main._max_uts
+    monkeypatch.setattr(main, "_max_uts", lambda path: scanned.append(path.name) or original_max_uts(path))
+
+    assert load_last_uts_from_raw(raw_dir) == 5_099
+    assert scanned == []
+
+
+def test_load_last_uts_from_raw_still_scans_page_dumps(tmp_path):
+    raw_dir = tmp_path / "lastfm"
+    _write_jsonl(raw_dir / "scrobbles_2024-01.jsonl", [{"uts": 100}, {"uts": 200}])
+    _write_jsonl(raw_dir / "recent_1_page_0001.jsonl", [{"date": {"uts": "300"}}, {"date": {"uts": "250"}}])
+
+    assert load_last_uts_from_raw(raw_dir) == 300
+    assert load_last_uts_from_raw(raw_dir, exact=True) == 300
+
+
 def test_determine_from_uts_prefers_raw_over_state(tmp_path, monkeypatch):
     raw_dir = tmp_path / "lastfm"
     _write_jsonl(raw_dir / "scrobbles_2024-01.jsonl", [{"uts": 200}])
@@ -195,3 +220,56 @@ def test_merge_raw_monthly_jsonl_normalizes_dict_fields_in_existing_rows(tmp_pat
     assert jan_rows[0]["uts"] == 1704067200
     assert jan_rows[0]["track"] == "Song"
     assert jan_rows[0]["mbid_track"] == "new"
+
+
+def test_normalize_builds_columns_and_skips_now_playing():
+    items = [
+        {"date": {"uts": "1704067200"}, "artist": {"#text": "A"}, "name": "Song", "album": {"#text": ""}, "mbid": ""},
+        {"@attr": {"nowplaying": "true"}, "artist": {"#text": "A"}, "name": "Live"},
+        {"date": {"uts": "1704067300"}, "artist": {"#text": "B"}, "name": "Other", "album": {"#text": "LP"}, "mbid": "m"},
+    ]
+
+    df = main.normalize(items)
+
+    assert list(df.columns) == main.NORMALIZED_COLUMNS
+    assert df["uts"].tolist() == [1704067200, 1704067300]
+    assert df["played_at_utc"].iloc[1] == pd.Timestamp(1704067300, unit="s", tz="UTC")
+    assert pd.isna(df["album"].iloc[0])
+    assert df["album"].iloc[1] == "LP"
+    assert main.normalize([]).empty
+
+
+def test_append_parquet_partitions_writes_one_file_per_month(tmp_path, monkeypatch):
+    curated = tmp_path / "scrobbles"
+    monkeypatch.setattr(main, "CURATED", curated)
+    items = [
+        {"date": {"uts": str(uts)}, "artist": {"#text": "A"}, "name": f"Song {uts}", "mbid": ""}
+        for uts in (1704067200, 1704067300, 1706745600)
+    ]
+
+    main.append_parquet_partitions(main.normalize(items))
+
+    files = sorted(path.relative_to(curated).parent.as_posix() for path in curated.rglob("*.parquet"))
+    assert files == ["year=2024/month=01", "year=2024/month=02"]
+    jan = pd.read_parquet(next((curated / "year=2024" / "month=01").glob("scrobbles_*.parquet")))
+    assert jan["uts"].tolist() == [1704067200, 1704067300]
+    assert "year" not in jan.columns
+
+
+def test_merge_raw_monthly_jsonl_appends_rows_newer_than_month_tail(tmp_path):
+    raw_dir = tmp_path / "lastfm"
+    jan_file = raw_dir / "scrobbles_2024-01.jsonl"
+    jan_file.parent.mkdir(parents=True)
+    # Legacy file without a trailing newline.
+    jan_file.write_text(json.dumps({"uts": 1704067200, "artist": "A", "track": "Song", "album": None}))
+    inode = jan_file.stat().st_ino
+
+    new_rows = [
+        {"uts": uts, "played_at_utc": pd.to_datetime(uts, unit="s", utc=True), "artist": "B", "track": "T", "album": None}
+        for uts in (1704153600, 1704070000, 1704153600)
+    ]
+    merge_raw_monthly_jsonl(new_rows, raw_dir=raw_dir)
+
+    assert jan_file.stat().st_ino == inode
+    assert [row["uts"] for row in _read_jsonl(jan_file)] == [1704067200, 1704070000, 1704153600]
+    assert load_last_uts_from_raw(raw_dir) == 1704153600